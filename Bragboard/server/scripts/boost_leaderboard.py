@@ -10,6 +10,9 @@ from src.entities.user import User
 from src.entities.todo import Shoutout
 from src.notifications.service import create_notification
 from src.notifications.models import NotificationCreate
+from src.users.service import rebuild_recognition_counts
+from src.search.service import rebuild_search_index
+from src.todos.service import rebuild_reaction_counts, rebuild_tag_usage
 
 def boost_leaderboard():
     db = SessionLocal()
@@ -65,6 +68,12 @@ def boost_leaderboard():
                 link="/dashboard"
             ))
 
+        # Shoutouts were inserted directly, so rebuild everything derived from them
+        rebuild_recognition_counts(db)
+        rebuild_search_index(db)
+        rebuild_tag_usage(db)
+        rebuild_reaction_counts(db)
+
         print("Leaderboard boosted successfully.")
 
     except Exception as e:
@@ -0,0 +1,28 @@
+import importlib
+import sys
+import os
+
+# Ensure the server directory is in python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.core import SessionLocal, create_db_tables
+from src.users.service import rebuild_recognition_counts
+
+# Load every entity module so the mappers' string relationships resolve
+for entity_module in ("user", "todo", "shoutout_report", "notification"):
+    importlib.import_module(f"src.entities.{entity_module}")
+
+def rebuild_leaderboard_counts():
+    create_db_tables()
+    db = SessionLocal()
+    try:
+        rows = rebuild_recognition_counts(db)
+        print(f"Rebuilt leaderboard counters for {rows} users.")
+    except Exception as e:
+        print(f"Error rebuilding leaderboard counters: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_leaderboard_counts()
@@ -1,16 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from src.database.core import get_db
+from src.database.replica import get_read_db
+from src.cache import response_cache
+from src.notifications.dispatcher import dispatcher
+from src.notifications.broker import broker
+from src.auth.auth import password_hasher
+from src.rate_limiter import limiter
+from src.auth.service import require_admin
 from . import service
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
+# /stats stays open: the employee leaderboard page charts its weekly activity
+ADMIN_ONLY = [Depends(require_admin)]
+
 @router.get("/stats")
-def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_read_db)):
     """Returns dashboard statistics for the admin."""
-    return service.get_admin_stats(db)
+    return service.get_admin_stats_snapshot(db)
+
+@router.get("/cache-stats", dependencies=ADMIN_ONLY)
+def get_cache_stats():
+    """Returns hit/miss statistics for the in-process response cache."""
+    return response_cache.stats()
+
+@router.get("/notification-outbox", dependencies=ADMIN_ONLY)
+def get_notification_outbox_metrics():
+    """Returns queue depth and delivery counters for the notification outbox."""
+    return {**dispatcher.metrics(), "push": broker.stats()}
+
+@router.get("/password-hashing", dependencies=ADMIN_ONLY)
+def get_password_hashing_metrics():
+    """Returns queue depth and queue-wait timings for the password hashing executor."""
+    return password_hasher.metrics()
+
+@router.get("/rate-limits", dependencies=ADMIN_ONLY)
+def get_rate_limit_stats():
+    """Returns the configured rate limit policies and allowed/limited counters."""
+    return limiter.stats()
 
-@router.delete("/users/{user_id}")
+@router.delete("/users/{user_id}", dependencies=ADMIN_ONLY)
 def delete_user(user_id: int, db: Session = Depends(get_db)):
     """Deletes a user by ID."""
     success = service.delete_user(db, user_id)
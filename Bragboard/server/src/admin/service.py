@@ -1,17 +1,30 @@
+import os
 from datetime import datetime, timedelta
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from src.entities.user import User
-from src.entities.todo import Shoutout, shoutout_recipient_table
+from src.entities.todo import Shoutout, Comment, UserRecognitionCount
 from src.entities.shoutout_report import ShoutoutReport, CommentReport, ReportStatus
+from src.cache import response_cache, Snapshot
+from src.auth.service import principal_cache
+from src.search.service import index_shoutouts
+from src.users.service import adjust_recognition_counts, get_recognition_deltas_for_sender
+from src.todos.service import adjust_tag_usage, get_tag_usage_deltas, adjust_reaction_counts, get_reaction_deltas_for_user
+
+admin_stats_snapshot = Snapshot(ttl=float(os.getenv("ADMIN_STATS_TTL", "15")))
 
 def get_admin_stats(db: Session):
-    today = datetime.utcnow()
-    total_users = db.query(User).count()
-    total_shoutouts = db.query(Shoutout).count()
-    
-    pending_shoutout_reports = db.query(ShoutoutReport).filter(ShoutoutReport.status == ReportStatus.PENDING).count()
-    pending_comment_reports = db.query(CommentReport).filter(CommentReport.status == ReportStatus.PENDING).count()
+    """
+    Computes dashboard statistics with three queries: one row of scalar
+    counts, the 7-day activity histogram, and per-department totals read
+    from the maintained recognition counters.
+    """
+    total_users, total_shoutouts, pending_shoutout_reports, pending_comment_reports = db.query(
+        db.query(func.count(User.id)).scalar_subquery(),
+        db.query(func.count(Shoutout.id)).scalar_subquery(),
+        db.query(func.count(ShoutoutReport.id)).filter(ShoutoutReport.status == ReportStatus.PENDING).scalar_subquery(),
+        db.query(func.count(CommentReport.id)).filter(CommentReport.status == ReportStatus.PENDING).scalar_subquery(),
+    ).one()
     
     flagged_items = pending_shoutout_reports + pending_comment_reports
     
@@ -40,9 +53,11 @@ def get_admin_stats(db: Session):
     # Shoutouts by Department (grouped by recipient department)
     dept_query = db.query(
         User.department,
-        func.count(shoutout_recipient_table.c.shoutout_id).label('count')
+        func.sum(UserRecognitionCount.received_count).label('count')
     ).join(
-        shoutout_recipient_table, User.id == shoutout_recipient_table.c.recipient_id
+        UserRecognitionCount, User.id == UserRecognitionCount.user_id
+    ).filter(
+        UserRecognitionCount.received_count > 0
     ).group_by(
         User.department
     ).all()
@@ -66,10 +81,33 @@ def get_admin_stats(db: Session):
         "department_stats": department_stats
     }
 
+def get_admin_stats_snapshot(db: Session):
+    """Serves admin stats from a short-TTL snapshot shared by all callers."""
+    return admin_stats_snapshot.get(lambda: get_admin_stats(db))
+
+def refresh_admin_stats_snapshot():
+    """Recomputes the snapshot with its own session; used by the background refresher."""
+    from src.database.core import SessionLocal
+    db = SessionLocal()
+    try:
+        return admin_stats_snapshot.refresh(lambda: get_admin_stats(db))
+    finally:
+        db.close()
+
 def delete_user(db: Session, user_id: int):
     user = db.get(User, user_id)
     if user:
+        # Shoutouts sent by the user are cascade-deleted with it
+        adjust_recognition_counts(db, get_recognition_deltas_for_sender(db, user_id))
+        # Their shoutouts and comments go too; refresh those search documents
+        sent = [sid for (sid,) in db.query(Shoutout.id).filter(Shoutout.sender_id == user_id)]
+        adjust_tag_usage(db, get_tag_usage_deltas(db, sent))
+        adjust_reaction_counts(db, get_reaction_deltas_for_user(db, user_id))
+        affected = sent + [sid for (sid,) in db.query(Comment.shoutout_id).filter(Comment.author_id == user_id).distinct()]
         db.delete(user)
+        index_shoutouts(db, affected)
         db.commit()
+        response_cache.bump()
+        principal_cache.bump()
         return True
     return False
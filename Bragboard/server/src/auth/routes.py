@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from src.auth.schemas import UserCreate, UserLogin, ChangePassword
-from src.auth.auth import create_access_token, verify_password, hash_password
+from src.auth.auth import create_access_token, password_hasher, PasswordHasherBusy
 from src.auth.utils import send_otp
 from src.database.core import get_db
+from src.rate_limiter import rate_limit
 from src.users import service as user_service
 from src.auth.utils import send_welcome_email
 router = APIRouter()
@@ -11,15 +13,35 @@ router = APIRouter()
 # In-memory OTP store (still okay for simple demo, but could be DB)
 otp_db = {}
 
+# The auth handlers are async so that waiting on the password hasher doesn't
+# hold a threadpool worker; their short DB calls still go through the threadpool.
+
+async def _hash(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+
+async def _verify(password: str, password_hash: str) -> tuple[bool, str | None]:
+    try:
+        return await password_hasher.verify_and_update(password, password_hash)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+
+def _save_password_hash(db: Session, db_user, password_hash: str):
+    db_user.password_hash = password_hash
+    db.commit()
+
 @router.post("/register")
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = user_service.get_user_by_email(db, user.email)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(user_service.get_user_by_email, db, user.email)
     if db_user:
         return {"error": "User already exists"}
-    new_user = user_service.create_user(db, user)
+    password_hash = await _hash(user.password)
+    new_user = await run_in_threadpool(user_service.create_user, db, user, password_hash)
 
     try:
-        send_welcome_email(new_user.email)
+        await run_in_threadpool(send_welcome_email, new_user.email)
     except Exception as e:
         print(f"Failed to send welcome email: {e}")  
     
@@ -32,16 +54,22 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         message="Welcome to Bragboard! Check out the latest shoutouts.",
         link="/dashboard"
     )
-    create_notification(db, welcome_notif)  
+    await run_in_threadpool(create_notification, db, welcome_notif)
 
     return {"msg": "User registered successfully", "role": new_user.role}
 
-@router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = user_service.get_user_by_email(db, user.email)
-    if not db_user or not verify_password(user.password, db_user.password_hash):
+@router.post("/login", dependencies=[Depends(rate_limit("login"))])
+async def login(user: UserLogin, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(user_service.get_user_by_email, db, user.email)
+    if not db_user:
         return {"error": "Invalid credentials"}
-    
+    valid, new_hash = await _verify(user.password, db_user.password_hash)
+    if not valid:
+        return {"error": "Invalid credentials"}
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS
+        await run_in_threadpool(_save_password_hash, db, db_user, new_hash)
+
     token = create_access_token({"sub": db_user.email, "role": db_user.role, "user_id": db_user.id})
     return {"access_token": token, "token_type": "bearer", "role": db_user.role}
 
@@ -63,11 +91,13 @@ def verify_otp_endpoint(email: str, otp: str):
     return {"msg": "OTP verified"}
 
 @router.post("/change-password")
-def change_password(payload: ChangePassword, db: Session = Depends(get_db)):
-    db_user = user_service.get_user_by_email(db, payload.email)
-    if not db_user or not verify_password(payload.current_password, db_user.password_hash):
+async def change_password(payload: ChangePassword, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(user_service.get_user_by_email, db, payload.email)
+    if not db_user:
         return {"error": "Invalid credentials"}
-    
-    db_user.password_hash = hash_password(payload.new_password)
-    db.commit()
+    valid, _ = await _verify(payload.current_password, db_user.password_hash)
+    if not valid:
+        return {"error": "Invalid credentials"}
+
+    await run_in_threadpool(_save_password_hash, db, db_user, await _hash(payload.new_password))
     return {"msg": "Password changed successfully"}
@@ -1,24 +1,119 @@
-from fastapi import Depends, HTTPException, status
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
 
 from jose import JWTError, jwt
 from src.auth.auth import SECRET_KEY, ALGORITHM
+from src.cache import LRUCache, VersionedCache
+from src.database.core import get_db
+from src.entities.user import User
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/token", auto_error=False)
 
-def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
-    credentials_exception = HTTPException(
+# sha256(token) -> verified claims; an entry is dropped once its exp passes
+token_cache = LRUCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")))
+
+# user id -> Principal. Bumped when users are created or deleted; the TTL
+# bounds how long a role change made outside the app goes unnoticed.
+principal_cache = VersionedCache(
+    maxsize=int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", "60")),
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by controllers, safe to share across requests."""
+    id: int
+    name: str
+    email: str
+    role: str
+    department: Optional[str] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == "admin"
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_token(token: str) -> dict:
+    """Verifies a JWT, reusing the claims of a token already verified and not yet expired."""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    claims = token_cache.get_many([digest]).get(digest)
+    if claims is not None:
+        if claims.get("exp", 0) > time.time():
+            return claims
+        token_cache.pop(digest)
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("user_id")
-        print(f"DEBUG AUTH: Decoded user_id={user_id} from token_sub={payload.get('sub')}") 
-        if user_id is None:
-            raise credentials_exception
-        return user_id
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    if "exp" in claims:
+        token_cache.set_many({digest: claims})
+    return claims
+
+
+def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    claims = decode_token(token)
+    user_id: int = claims.get("user_id")
+    if user_id is None:
+        raise _credentials_exception()
+    logger.debug("Authenticated user_id=%s sub=%s", user_id, claims.get("sub"))
+    return user_id
+
+
+def get_current_user_id_from_header_or_query(
+    header_token: Optional[str] = Depends(oauth2_scheme_optional),
+    token: Optional[str] = Query(None, description="Bearer token, for clients such as EventSource that can't set headers"),
+) -> int:
+    return get_current_user_id(header_token or token or "")
+
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Returns the cached Principal for a user id, or None if no such user exists."""
+    def load():
+        user = db.get(User, user_id)
+        if not user:
+            return None
+        return Principal(id=user.id, name=user.name, email=user.email, role=user.role, department=user.department)
+
+    return principal_cache.get_or_set(user_id, load)
+
+
+def get_current_principal(
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    FastAPI dependency resolving the bearer token to a Principal once per
+    request; the result is also left on request.state.principal.
+    """
+    principal = load_principal(db, user_id)
+    if principal is None:
+        raise _credentials_exception()
+    request.state.principal = principal
+    return principal
+
 
+def require_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if not principal.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return principal
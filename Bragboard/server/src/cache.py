@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """
+    In-process TTL + LRU cache tied to a global write version.
+
+    Every write path that changes cached data calls bump(); entries stored
+    under an older version are treated as misses, so reads never serve data
+    older than the last write made through this process.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+
+    def _lookup(self, key, now: float):
+        """Returns (hit, value_or_version)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] == self.version and entry[1] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, entry[2]
+            self.misses += 1
+            return False, self.version
+
+    def _store(self, key, version: int, now: float, value):
+        with self._lock:
+            # A write landed while loading; don't store a possibly stale value.
+            if version == self.version:
+                self._data[key] = (version, now + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def get_or_set(self, key, loader):
+        now = time.monotonic()
+        hit, found = self._lookup(key, now)
+        if hit:
+            return found
+        value = loader()
+        self._store(key, found, now, value)
+        return value
+
+    async def aget_or_set(self, key, loader):
+        """get_or_set for an async loader (a zero-argument coroutine function)."""
+        now = time.monotonic()
+        hit, found = self._lookup(key, now)
+        if hit:
+            return found
+        value = await loader()
+        self._store(key, found, now, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class LRUCache:
+    """Small thread-safe bounded mapping with least-recently-used eviction."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> dict:
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+        return found
+
+    def set_many(self, items: dict):
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class Snapshot:
+    """
+    Holds one computed value for `ttl` seconds. Concurrent callers that
+    find it stale wait for a single recomputation instead of each running
+    the loader (single-flight).
+    """
+
+    def __init__(self, ttl: float = 15.0):
+        self.ttl = ttl
+        self.computations = 0
+        self._value = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return self._value is not None and self._expires_at > time.monotonic()
+
+    def get(self, loader):
+        if self._fresh():
+            return self._value
+        with self._lock:
+            if not self._fresh():
+                self._store(loader())
+            return self._value
+
+    def refresh(self, loader):
+        with self._lock:
+            self._store(loader())
+            return self._value
+
+    def _store(self, value):
+        self._value = value
+        self._expires_at = time.monotonic() + self.ttl
+        self.computations += 1
+
+
+response_cache = VersionedCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "30")),
+)
+
+tag_id_cache = LRUCache(maxsize=int(os.getenv("TAG_ID_CACHE_SIZE", "1024")))
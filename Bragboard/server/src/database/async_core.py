@@ -0,0 +1,70 @@
+import os
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.database.core import DATABASE_URL, DB_PROFILE, install_sqlite_pragmas, profile_settings
+
+# Opt-in native async mode. When enabled, the hot read/reaction/notification
+# endpoints are served by async handlers on an AsyncSession, so idle-heavy
+# clients (SSE, polling) don't each hold a threadpool worker. Requires
+# aiosqlite or asyncpg depending on the database.
+ASYNC_DB_ENABLED = os.getenv("ASYNC_DB", "0").lower() in ("1", "true", "yes")
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swaps a sync database URL's driver for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+class AsyncBridgeSession(Session):
+    """The sync Session wrapped by every AsyncSession; session events listen on this class."""
+
+
+def build_async_engine(url: str, profile: str = DB_PROFILE):
+    """Async counterpart of build_engine, using the same profile's pool settings and PRAGMAs."""
+    settings = profile_settings(url, profile)
+    engine_kwargs = dict(settings["engine"])
+    if engine_kwargs.get("poolclass") is QueuePool:
+        engine_kwargs["poolclass"] = AsyncAdaptedQueuePool
+
+    new_engine = create_async_engine(url, echo=False, **engine_kwargs)
+
+    if make_url(url).get_backend_name() == "sqlite":
+        install_sqlite_pragmas(new_engine.sync_engine, settings["pragmas"])
+
+    return new_engine
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (to_async_url(DATABASE_URL) if ASYNC_DB_ENABLED else None)
+
+async_engine = build_async_engine(ASYNC_DATABASE_URL) if ASYNC_DB_ENABLED else None
+
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncBridgeSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    """
+    FastAPI dependency that yields an AsyncSession on the primary.
+    Only used by routes mounted when ASYNC_DB is enabled; read-only routes
+    use replica.get_async_read_db so READ_DATABASE_URL still applies.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
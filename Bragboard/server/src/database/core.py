@@ -1,7 +1,9 @@
 import os
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 
@@ -17,26 +19,131 @@ SQLITE_DATABASE_URL = f"sqlite:///{DATA_DIR / 'app.db'}"
 
 
 
-DATABASE_URL = os.getenv("DATABASE_URL", SQLITE_DATABASE_URL)
+# Named engine profiles, selected with DB_PROFILE. "dialect" pins the
+# database a profile is meant for (None = any). SQLite "pragmas" run on
+# every new DBAPI connection; "engine" holds extra create_engine()
+# keyword arguments (pool sizing, pre-ping, ...).
+ENGINE_PROFILES = {
+    "dev": {
+        "dialect": None,
+        "pragmas": {
+            "foreign_keys": "ON",
+            "busy_timeout": 5000,
+        },
+        "engine": {},
+    },
+    "prod-sqlite": {
+        "dialect": "sqlite",
+        "pragmas": {
+            "foreign_keys": "ON",
+            "journal_mode": "WAL",       # readers don't block the writer
+            "synchronous": "NORMAL",     # fsync at checkpoints only; safe with WAL
+            "busy_timeout": 10000,       # wait for the write lock instead of "database is locked"
+            "cache_size": -64000,        # 64 MB page cache
+            "mmap_size": 268435456,      # 256 MB memory-mapped reads
+            "temp_store": "MEMORY",
+        },
+        "engine": {
+            # Keep connections (and their page cache / mmap) alive between requests
+            "poolclass": QueuePool,
+            "pool_size": 10,
+            "max_overflow": 10,
+        },
+    },
+    "prod-postgres": {
+        "dialect": "postgresql",
+        "pragmas": {},
+        "engine": {
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_timeout": 30,
+            "pool_recycle": 1800,
+            "pool_pre_ping": True,
+        },
+    },
+}
+
+DB_PROFILE = os.getenv("DB_PROFILE", "dev")
+if DB_PROFILE not in ENGINE_PROFILES:
+    raise ValueError(f"Unknown DB_PROFILE {DB_PROFILE!r}; expected one of {', '.join(ENGINE_PROFILES)}")
+
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    POSTGRES_DATABASE_URL if DB_PROFILE == "prod-postgres" else SQLITE_DATABASE_URL
+)
 
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args=connect_args,
-    echo=False,
-)
+def profile_settings(url: str, profile: str = DB_PROFILE) -> dict:
+    """The named profile's settings, after checking it fits the URL's database."""
+    settings = ENGINE_PROFILES[profile]
+    dialect = make_url(url).get_backend_name()
+    if settings["dialect"] and settings["dialect"] != dialect:
+        raise ValueError(f"DB_PROFILE {profile!r} expects a {settings['dialect']} URL, got {dialect}")
+    return settings
+
 
-# Enable foreign key support for SQLite
-if "sqlite" in DATABASE_URL:
-    from sqlalchemy import event
-    @event.listens_for(engine, "connect")
+def install_sqlite_pragmas(sync_engine, pragmas: dict):
+    """Runs the given PRAGMAs on every new DBAPI connection of `sync_engine`."""
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
         cursor.close()
 
 
+def build_engine(url: str, profile: str = DB_PROFILE):
+    """Creates an engine for `url` with the named profile's pool settings and PRAGMAs."""
+    settings = profile_settings(url, profile)
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    connect_args = {"check_same_thread": False} if is_sqlite else {}
+
+    new_engine = create_engine(
+        url,
+        connect_args=connect_args,
+        echo=False,
+        **settings["engine"],
+    )
+
+    if is_sqlite:
+        install_sqlite_pragmas(new_engine, settings["pragmas"])
+
+    return new_engine
+
+
+def describe_engine(target_engine, profile: str = DB_PROFILE) -> dict:
+    """
+    Settings of an engine: pool options as configured by the profile it was
+    built with, PRAGMAs read back from the live connection.
+    """
+    configured = profile_settings(target_engine.url, profile)["engine"]
+    pool = target_engine.pool
+    info = {
+        "profile": profile,
+        "url": target_engine.url.render_as_string(hide_password=True),
+        "dialect": target_engine.dialect.name,
+        "pool": type(pool).__name__,
+    }
+    if hasattr(pool, "size"):
+        info["pool_size"] = pool.size()
+        # Unset options fall back to create_engine()'s defaults
+        info["max_overflow"] = configured.get("max_overflow", 10)
+    info["pre_ping"] = configured.get("pool_pre_ping", False)
+    if target_engine.dialect.name == "sqlite":
+        with target_engine.connect() as conn:
+            info["pragmas"] = {
+                name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in ("foreign_keys", "journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store")
+            }
+    return info
+
+
+engine = build_engine(DATABASE_URL)
+
+
 Base = declarative_base()
 
 
@@ -61,7 +168,49 @@ def get_db():
 
 
 
+def insert_ignoring_conflicts(db, table):
+    """
+    Returns an INSERT for `table` that silently skips rows violating a
+    unique/primary key, using the dialect's native ON CONFLICT DO NOTHING.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert(table).on_conflict_do_nothing()
+    from sqlalchemy import insert
+    return insert(table).prefix_with("IGNORE")
+
+
+def adjust_counters(db, count_column, key_column, deltas: dict):
+    """
+    Applies {key: delta} to a counter table without committing: missing
+    rows are inserted at zero (conflict-tolerant), then one UPDATE is
+    issued per distinct delta value.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = count_column.table
+    db.execute(insert_ignoring_conflicts(db, table).values([
+        {key_column.name: key, count_column.name: 0} for key in deltas
+    ]))
+    by_delta = {}
+    for key, delta in deltas.items():
+        by_delta.setdefault(delta, []).append(key)
+    for delta, keys in by_delta.items():
+        db.execute(table.update().where(key_column.in_(keys)).values({count_column.name: count_column + delta}))
+
+
 def create_db_tables():
-    """Creates all database tables defined in the Base metadata."""
+    """
+    Creates all database tables defined in the Base metadata, plus any
+    indexes added to tables that already existed (create_all skips those).
+    """
     Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
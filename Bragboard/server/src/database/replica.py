@@ -0,0 +1,123 @@
+import hashlib
+import os
+import time
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.cache import LRUCache
+from src.database.core import SessionLocal, build_engine, engine
+from src.database.async_core import (
+    ASYNC_DB_ENABLED, AsyncBridgeSession, AsyncSessionLocal, async_engine, build_async_engine, to_async_url,
+)
+
+# Optional read-only replica. For local testing this can be a second SQLite
+# file, or a read-only view of the primary, e.g.
+#   READ_DATABASE_URL="sqlite:///file:data/app.db?mode=ro&uri=true"
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+read_engine = build_engine(READ_DATABASE_URL) if READ_DATABASE_URL else engine
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
+# The async routes (ASYNC_DB) read the same replica through its async driver
+async_read_engine = (
+    build_async_engine(to_async_url(READ_DATABASE_URL)) if ASYNC_DB_ENABLED and READ_DATABASE_URL else async_engine
+)
+
+AsyncReadSessionLocal = sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncBridgeSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# After a client writes, its reads go to the primary for this long so it
+# always sees its own changes despite replica lag.
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+_recent_writers = LRUCache(maxsize=10000)
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def _client_key(authorization, host) -> str:
+    """Identifies a client by its bearer token when present, otherwise by address."""
+    raw = authorization or f"host:{host}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _wrote_recently(key: str) -> bool:
+    wrote_at = _recent_writers.get_many([key]).get(key)
+    return wrote_at is not None and time.monotonic() - wrote_at < REPLICA_STICKY_SECONDS
+
+
+def read_cache_key(db, *parts) -> tuple:
+    """
+    Response cache key for a read served by `db`. Replica results are kept
+    apart from primary ones: a lagging replica may fill the cache under a
+    version bumped by a write, and that page must not reach the writer
+    whose reads are pinned to the primary.
+    """
+    return (db.info.get("read_source", "primary"), *parts)
+
+
+def _reads_from_primary(request: Request) -> bool:
+    key = _client_key(request.headers.get("authorization"), request.client.host if request.client else None)
+    return read_engine is engine or _wrote_recently(key)
+
+
+def get_read_db(request: Request):
+    """
+    FastAPI dependency for read-only endpoints. Yields a replica session,
+    or a primary session if no replica is configured or this client wrote
+    within REPLICA_STICKY_SECONDS.
+    """
+    use_primary = _reads_from_primary(request)
+    db = SessionLocal() if use_primary else ReadSessionLocal()
+    db.info["read_source"] = "primary" if use_primary else "replica"
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """get_read_db for the async routes: an AsyncSession on the replica or, when sticky, the primary."""
+    use_primary = _reads_from_primary(request)
+    async with (AsyncSessionLocal() if use_primary else AsyncReadSessionLocal()) as db:
+        db.info["read_source"] = "primary" if use_primary else "replica"
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware (so streaming responses pass through untouched)
+    that records clients whose write requests succeeded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or read_engine is engine:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        authorization = headers.get(b"authorization", b"").decode() or None
+        client = scope.get("client")
+        key = _client_key(authorization, client[0] if client else None)
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                _recent_writers.set_many({key: time.monotonic()})
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship, backref
 from datetime import datetime
 import enum
@@ -15,12 +15,15 @@ class ReportStatus(enum.Enum):
 
 class ShoutoutReport(Base):
     __tablename__ = "shoutout_reports"
+    __table_args__ = (
+        Index("ix_shoutout_reports_created_at_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     shoutout_id = Column(Integer, ForeignKey("shoutouts.id", ondelete="CASCADE"), nullable=False)
     reporter_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
     reason = Column(String(200), nullable=False)  # e.g., "inappropriate content", "spam", "harassment"
     description = Column(Text, nullable=True)  # Optional detailed description
-    status = Column(SQLEnum(ReportStatus), default=ReportStatus.PENDING, nullable=False)
+    status = Column(SQLEnum(ReportStatus), default=ReportStatus.PENDING, nullable=False, index=True)
     resolved_by = Column(Integer, ForeignKey(User.id, ondelete="SET NULL"), nullable=True)
     resolved_at = Column(DateTime, nullable=True)
     resolution_notes = Column(Text, nullable=True)  # Admin's notes when resolving
@@ -39,7 +42,7 @@ class CommentReport(Base):
     reporter_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
     reason = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(SQLEnum(ReportStatus), default=ReportStatus.PENDING, nullable=False)
+    status = Column(SQLEnum(ReportStatus), default=ReportStatus.PENDING, nullable=False, index=True)
     resolved_by = Column(Integer, ForeignKey(User.id, ondelete="SET NULL"), nullable=True)
     resolved_at = Column(DateTime, nullable=True)
     resolution_notes = Column(Text, nullable=True)
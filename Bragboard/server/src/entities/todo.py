@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship, backref
 from datetime import datetime
 from src.database.core import Base
@@ -13,6 +13,11 @@ class Tag(Base):
 
 class Shoutout(Base):
     __tablename__ = "shoutouts"
+    __table_args__ = (
+        Index("ix_shoutouts_created_at_id", "created_at", "id"),
+        # Per-sender timelines
+        Index("ix_shoutouts_sender_id_created_at_id", "sender_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     sender_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
     sender = relationship("User", foreign_keys=[sender_id], backref=backref("shoutouts_sent", cascade="all, delete-orphan"))
@@ -30,6 +35,10 @@ class Shoutout(Base):
 
 class Comment(Base):
     __tablename__ = "shoutout_comments"
+    __table_args__ = (
+        # Thread pages, per-parent reply walks and reply counts
+        Index("ix_shoutout_comments_shoutout_id_parent_id_created_at_id", "shoutout_id", "parent_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     author_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
     author = relationship("User", backref=backref("comments_made", cascade="all, delete-orphan"))
@@ -47,12 +56,16 @@ shoutout_recipient_table = Table(
     "shoutout_recipients", Base.metadata,
     Column("shoutout_id", Integer, ForeignKey("shoutouts.id", ondelete="CASCADE"), primary_key=True),
     Column("recipient_id", Integer, ForeignKey(User.id, ondelete="CASCADE"), primary_key=True),
+    # Per-recipient timelines
+    Index("ix_shoutout_recipients_recipient_id_shoutout_id", "recipient_id", "shoutout_id"),
 )
 
 shoutout_tag_table = Table(
     "shoutout_tags", Base.metadata,
     Column("shoutout_id", Integer, ForeignKey("shoutouts.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # Reverse index for tag -> shoutouts lookups
+    Index("ix_shoutout_tags_tag_id_shoutout_id", "tag_id", "shoutout_id"),
 )
 
 shoutout_likes_table = Table(
@@ -72,3 +85,26 @@ shoutout_stars_table = Table(
     Column("shoutout_id", Integer, ForeignKey("shoutouts.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", Integer, ForeignKey(User.id, ondelete="CASCADE"), primary_key=True),
 )
+
+class UserRecognitionCount(Base):
+    """Materialized number of shoutouts each user has received, backing the leaderboard."""
+    __tablename__ = "user_recognition_counts"
+    user_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), primary_key=True)
+    received_count = Column(Integer, default=0, nullable=False, index=True)
+
+class ShoutoutReactionCount(Base):
+    """Materialized number of reactions of each kind (likes, claps, stars) per shoutout."""
+    __tablename__ = "shoutout_reaction_counts"
+    shoutout_id = Column(Integer, ForeignKey("shoutouts.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(10), primary_key=True)
+    reaction_count = Column(Integer, default=0, nullable=False)
+
+class TagUsageDaily(Base):
+    """Materialized number of shoutouts using each tag per (UTC) day, backing popular-tag windows."""
+    __tablename__ = "tag_usage_daily"
+    __table_args__ = (
+        Index("ix_tag_usage_daily_day", "day"),
+    )
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    uses = Column(Integer, default=0, nullable=False)
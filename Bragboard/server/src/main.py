@@ -1,3 +1,6 @@
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -8,24 +11,112 @@ from src.auth.routes import router as auth_router
 from src.users.controller import router as users_router
 from src.todos.controller import router as shoutouts_router
 from src.todos.controller import router as shoutouts_router
+from src.todos.controller import tags_router
 from src.shoutout_reports.controller import router as reports_router, comment_router
 from src.admin.controller import router as admin_router
-from src.database.core import engine, Base
+from src.database.core import create_db_tables, SessionLocal, engine, describe_engine
+from src.database.replica import read_engine, async_read_engine, ReadYourWritesMiddleware
+from src.database.async_core import ASYNC_DB_ENABLED, async_engine
 
 # Import all entities to ensure they are registered with Base.metadata
 from src.entities.user import User
-from src.entities.todo import Shoutout, Comment, Tag
+from src.entities.todo import Shoutout, Comment, Tag, TagUsageDaily, ShoutoutReactionCount, UserRecognitionCount
 from src.entities.shoutout_report import ShoutoutReport, CommentReport
-from src.entities.notification import Notification
+from src.entities.notification import Notification, NotificationOutbox, NotificationUnreadCount
+from src.notifications.dispatcher import dispatcher
+from src.users.service import ensure_recognition_counts
+from src.notifications.service import ensure_unread_counts
+from src.search.service import ensure_search_index
+from src.todos.service import ensure_tag_usage, ensure_reaction_counts
+from src.admin.service import refresh_admin_stats_snapshot
+from src.shoutout_reports import export_jobs
+from src.auth.auth import password_hasher
+
+# Report the effective engine profile so misconfiguration is visible at boot
+print(f"Database engine: {describe_engine(engine)}")
+if read_engine is not engine:
+    print(f"Read replica engine: {describe_engine(read_engine)}")
+if ASYNC_DB_ENABLED:
+    print(f"Async database engine: {async_engine.url.render_as_string(hide_password=True)} ({type(async_engine.pool).__name__})")
 
 # Create tables
-Base.metadata.create_all(bind=engine)
+create_db_tables()
+
+# Backfill leaderboard and unread counters for databases created before they existed
+with SessionLocal() as db:
+    ensure_recognition_counts(db)
+    ensure_unread_counts(db)
+    ensure_search_index(db)
+    ensure_tag_usage(db)
+    ensure_reaction_counts(db)
 
 app = FastAPI()
 
+
+@app.on_event("startup")
+async def start_notification_dispatcher():
+    dispatcher.start()
+
+
+# Optional: keep the admin stats snapshot warm so admin polls never compute it
+ADMIN_STATS_REFRESH_INTERVAL = float(os.getenv("ADMIN_STATS_REFRESH_INTERVAL", "0"))
+
+async def refresh_admin_stats_forever():
+    while True:
+        try:
+            await asyncio.to_thread(refresh_admin_stats_snapshot)
+        except Exception as e:
+            print(f"Admin stats refresh failed: {e}")
+        await asyncio.sleep(ADMIN_STATS_REFRESH_INTERVAL)
+
+
+@app.on_event("startup")
+async def start_admin_stats_refresher():
+    if ADMIN_STATS_REFRESH_INTERVAL > 0:
+        app.state.admin_stats_refresher = asyncio.create_task(refresh_admin_stats_forever())
+
+
+# Shutdown hooks run in registration order: stop the background work before disposing the engines
+@app.on_event("shutdown")
+async def stop_admin_stats_refresher():
+    refresher = getattr(app.state, "admin_stats_refresher", None)
+    if refresher is None:
+        return
+    refresher.cancel()
+    try:
+        await refresher
+    except asyncio.CancelledError:
+        pass
+
+
+@app.on_event("shutdown")
+async def stop_notification_dispatcher():
+    await dispatcher.stop()
+
+
+@app.on_event("shutdown")
+def stop_pdf_export_workers():
+    export_jobs.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    if ASYNC_DB_ENABLED:
+        await async_engine.dispose()
+        if async_read_engine is not async_engine:
+            await async_read_engine.dispose()
+
+
 # Allow frontend dev origin; adjust list as needed
 origins = ["*"]
 
+app.add_middleware(ReadYourWritesMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -34,9 +125,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Async handlers take precedence over the sync routes with the same paths
+if ASYNC_DB_ENABLED:
+    from src.users.async_controller import router as async_users_router
+    from src.todos.async_controller import router as async_shoutouts_router
+    from src.notifications.async_controller import router as async_notifications_router
+    app.include_router(async_users_router)
+    app.include_router(async_shoutouts_router)
+    app.include_router(async_notifications_router)
+
 app.include_router(auth_router, prefix="/auth")
 app.include_router(users_router) # Prefix is defined in controller
 app.include_router(shoutouts_router) # Prefix is defined in controller
+app.include_router(tags_router)
 app.include_router(reports_router)
 app.include_router(comment_router)
 app.include_router(comment_router)
@@ -45,6 +146,9 @@ app.include_router(admin_router)
 from src.notifications.controller import router as notifications_router
 app.include_router(notifications_router)
 
+from src.search.controller import router as search_router
+app.include_router(search_router)
+
 @app.post("/test-email")
 def test_email_endpoint(email: str):
     from src.auth.utils import send_welcome_email
@@ -0,0 +1,42 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.async_core import get_async_db
+from src.database.replica import get_async_read_db
+from src.auth.service import Principal, get_current_principal
+from src.notifications import async_service
+from src.notifications.models import NotificationPage, NotificationMarkRead
+
+# Mounted ahead of controller.router when ASYNC_DB is enabled; same paths and responses.
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+@router.get("/inbox", response_model=NotificationPage)
+async def get_notifications_page(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_read_db),
+    principal: Principal = Depends(get_current_principal)
+):
+    try:
+        return await async_service.get_notifications_page(db, principal.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/unread-count")
+async def get_unread_count(db: AsyncSession = Depends(get_async_read_db), principal: Principal = Depends(get_current_principal)):
+    return {"count": await async_service.get_unread_count(db, principal.id)}
+
+@router.patch("/read")
+async def mark_notifications_as_read(payload: NotificationMarkRead, db: AsyncSession = Depends(get_async_db), principal: Principal = Depends(get_current_principal)):
+    """Marks `ids`, everything up to `before`, or (with neither) all notifications as read."""
+    updated = await async_service.mark_many_as_read(db, principal.id, payload.ids, payload.before)
+    return {"updated": updated, "unread_count": await async_service.get_unread_count(db, principal.id)}
+
+@router.patch("/{notification_id}/read")
+async def mark_notification_as_read(notification_id: int, db: AsyncSession = Depends(get_async_db), principal: Principal = Depends(get_current_principal)):
+    if not await async_service.mark_as_read(db, notification_id, principal.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notification not found"
+        )
+    return {"message": "Notification marked as read"}
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.entities.notification import Notification
+from .service import (
+    notifications_page_statement, notifications_page, mark_read_statement, unread_count_statement,
+    adjust_unread_counts, _queue_events,
+)
+
+# Async counterparts of the inbox services in service.py. Counter updates
+# reuse the sync helpers through run_sync; events queued on the bridged
+# sync session are published by the same after_commit hook.
+
+async def get_notifications_page(db: AsyncSession, user_id: int, limit: int = 20, cursor: str = None):
+    rows = (await db.execute(notifications_page_statement(user_id, limit, cursor))).scalars().all()
+    return notifications_page(rows, limit)
+
+async def get_unread_count(db: AsyncSession, user_id: int):
+    count = (await db.execute(unread_count_statement(user_id))).scalar()
+    return max(count or 0, 0)
+
+async def _record_read(db: AsyncSession, user_id: int, updated: int):
+    await db.run_sync(adjust_unread_counts, {user_id: -updated})
+    _queue_events(db.sync_session, [(user_id, {"event": "read"})])
+
+async def mark_many_as_read(db: AsyncSession, user_id: int, ids: List[int] = None, before: datetime = None) -> int:
+    if ids is not None and not ids:
+        return 0
+    updated = (await db.execute(mark_read_statement(user_id, ids, before))).rowcount
+    if updated:
+        await _record_read(db, user_id, updated)
+    await db.commit()
+    return updated
+
+async def mark_as_read(db: AsyncSession, notification_id: int, user_id: int) -> bool:
+    """Returns False if the notification doesn't exist or isn't the user's."""
+    exists = (await db.execute(
+        select(Notification.id).where(Notification.id == notification_id, Notification.recipient_id == user_id)
+    )).scalar()
+    if exists is None:
+        return False
+    # Conditional UPDATE so concurrent reads of the same item decrement once
+    updated = (await db.execute(mark_read_statement(user_id, notification_id=notification_id))).rowcount
+    if updated:
+        await _record_read(db, user_id, updated)
+        await db.commit()
+    return True
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+
+class NotificationBroker:
+    """
+    In-process pub/sub fanning notification events out to connected SSE
+    clients. publish() is safe to call from worker threads; each
+    subscriber gets a bounded queue that drops its oldest event when full.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.published = 0
+        self.dropped = 0
+        self._subscribers = defaultdict(set)
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id: int, event: dict):
+        with self._lock:
+            queues = list(self._subscribers.get(user_id, ()))
+            loop = self._loop
+        if not queues or loop is None or loop.is_closed():
+            return
+        self.published += 1
+        loop.call_soon_threadsafe(self._deliver, queues, event)
+
+    def _deliver(self, queues, event: dict):
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connected_users": len(self._subscribers),
+                "connections": sum(len(q) for q in self._subscribers.values()),
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+
+broker = NotificationBroker()
@@ -1,28 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from src.database.core import get_db
-from src.auth.service import get_current_user_id
-from src.notifications import service
-from src.notifications.models import NotificationRead
+from src.database.core import get_db, SessionLocal
+from src.database.replica import get_read_db
+from src.database.async_core import ASYNC_DB_ENABLED, AsyncSessionLocal
+from src.auth.service import Principal, get_current_principal, get_current_user_id_from_header_or_query
+from src.notifications.broker import broker
+from src.notifications import service, async_service
+from src.notifications.models import NotificationRead, NotificationPage, NotificationMarkRead
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 @router.get("", response_model=list[NotificationRead])
-def get_notifications(db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
-    print(f"DEBUG NOTIF CONTROLLER: Fetching for user_id={user_id}")
-    return service.get_my_notifications(db, user_id)
+def get_notifications(db: Session = Depends(get_read_db), principal: Principal = Depends(get_current_principal)):
+    return service.get_my_notifications(db, principal.id)
+
+@router.get("/inbox", response_model=NotificationPage)
+def get_notifications_page(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    db: Session = Depends(get_read_db),
+    principal: Principal = Depends(get_current_principal)
+):
+    try:
+        return service.get_notifications_page(db, principal.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.get("/unread-count")
-def get_unread_count(db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
-    count = service.get_unread_count(db, user_id)
+def get_unread_count(db: Session = Depends(get_read_db), principal: Principal = Depends(get_current_principal)):
+    count = service.get_unread_count(db, principal.id)
     return {"count": count}
 
+@router.patch("/read")
+def mark_notifications_as_read(payload: NotificationMarkRead, db: Session = Depends(get_db), principal: Principal = Depends(get_current_principal)):
+    """Marks `ids`, everything up to `before`, or (with neither) all notifications as read."""
+    updated = service.mark_many_as_read(db, principal.id, payload.ids, payload.before)
+    return {"updated": updated, "unread_count": service.get_unread_count(db, principal.id)}
+
 @router.patch("/{notification_id}/read")
-def mark_notification_as_read(notification_id: int, db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
-    notification = service.mark_as_read(db, notification_id, user_id)
+def mark_notification_as_read(notification_id: int, db: Session = Depends(get_db), principal: Principal = Depends(get_current_principal)):
+    notification = service.mark_as_read(db, notification_id, principal.id)
     if not notification:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     return {"message": "Notification marked as read"}
+
+
+SSE_HEARTBEAT_SECONDS = 15
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _read_unread_count(user_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return service.get_unread_count(db, user_id)
+    finally:
+        db.close()
+
+async def _current_unread_count(user_id: int) -> int:
+    if ASYNC_DB_ENABLED:
+        async with AsyncSessionLocal() as db:
+            return await async_service.get_unread_count(db, user_id)
+    return await asyncio.to_thread(_read_unread_count, user_id)
+
+@router.get("/stream")
+async def stream_notifications(request: Request, user_id: int = Depends(get_current_user_id_from_header_or_query)):
+    """
+    Server-sent events: pushes `notification` events as they are committed
+    and an `unread_count` event after each burst, replacing polling.
+    """
+    queue = broker.subscribe(user_id)
+
+    async def events():
+        try:
+            yield _sse("unread_count", {"count": await _current_unread_count(user_id)})
+            while True:
+                try:
+                    batch = [await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)]
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                for item in batch:
+                    if item["event"] == "notification":
+                        yield _sse("notification", item["data"])
+                # One count read per burst, however many events it held
+                yield _sse("unread_count", {"count": await _current_unread_count(user_id)})
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+from src.database.core import SessionLocal
+from src.notifications.service import drain_outbox, get_outbox_depth
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxDispatcher:
+    """
+    Background asyncio task that drains the notification outbox.
+
+    Each drain runs in a worker thread with its own session. A full batch
+    is followed immediately by another drain; otherwise the task sleeps
+    for poll_interval or until wake() is called by a writer.
+    """
+
+    def __init__(self, batch_size: int = 100, poll_interval: float = 1.0):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.delivered = 0
+        self.failed = 0
+        self.errors = 0
+        self.last_drain_at = None
+        self._task = None
+        self._loop = None
+        self._wakeup = None
+
+    def _drain_once(self) -> dict:
+        db = SessionLocal()
+        try:
+            return drain_outbox(db, self.batch_size)
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            try:
+                result = await asyncio.to_thread(self._drain_once)
+                self.delivered += result["delivered"]
+                self.failed += result["failed"]
+                self.last_drain_at = datetime.utcnow()
+                if result["delivered"] + result["failed"] >= self.batch_size:
+                    continue
+            except Exception:
+                self.errors += 1
+                logger.exception("Notification outbox drain failed")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Deliver whatever is still due before shutting down
+        await asyncio.to_thread(self._drain_once)
+
+    def wake(self):
+        """Thread-safe nudge so freshly committed intents go out without waiting for the next poll."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def metrics(self) -> dict:
+        db = SessionLocal()
+        try:
+            depth = get_outbox_depth(db)
+        finally:
+            db.close()
+        return {
+            "running": self._task is not None,
+            "queue_depth": depth["pending"],
+            "dead_letters": depth["dead"],
+            "delivered": self.delivered,
+            "failed_attempts": self.failed,
+            "drain_errors": self.errors,
+            "last_drain_at": self.last_drain_at,
+        }
+
+
+dispatcher = OutboxDispatcher(
+    batch_size=int(os.getenv("NOTIFICATION_OUTBOX_BATCH_SIZE", "100")),
+    poll_interval=float(os.getenv("NOTIFICATION_OUTBOX_POLL_INTERVAL", "1.0")),
+)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class NotificationBase(BaseModel):
     type: str
@@ -21,3 +21,11 @@ class NotificationRead(NotificationBase):
 
 class NotificationUpdate(BaseModel):
     is_read: Optional[bool] = None
+
+class NotificationPage(BaseModel):
+    items: List[NotificationRead] = []
+    next_cursor: Optional[str] = None
+
+class NotificationMarkRead(BaseModel):
+    ids: Optional[List[int]] = None
+    before: Optional[datetime] = None
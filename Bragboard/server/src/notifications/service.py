@@ -1,7 +1,49 @@
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import insert, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from collections import Counter
 from sqlalchemy.orm import Session
-from src.entities.notification import Notification
+from sqlalchemy import and_, or_, event
+from src.database.core import adjust_counters, SessionLocal
+from src.database.async_core import AsyncBridgeSession
+from src.notifications.broker import broker
+from src.pagination import encode_cursor, decode_cursor
+from src.entities.notification import Notification, NotificationOutbox, NotificationUnreadCount
 from src.notifications.models import NotificationCreate, NotificationUpdate
 
+OUTBOX_MAX_ATTEMPTS = 5
+
+
+def _queue_events(db: Session, events):
+    """Holds (user_id, event) pairs on the session until its transaction commits."""
+    db.info.setdefault("notification_events", []).extend(events)
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(AsyncBridgeSession, "after_commit")
+def _publish_committed_events(session):
+    for user_id, payload in session.info.pop("notification_events", []):
+        broker.publish(user_id, payload)
+
+@event.listens_for(SessionLocal, "after_rollback")
+@event.listens_for(AsyncBridgeSession, "after_rollback")
+def _discard_rolled_back_events(session):
+    session.info.pop("notification_events", None)
+
+def _notification_event(n, created_at: datetime, notification_id: int = None) -> dict:
+    return {
+        "event": "notification",
+        "data": {
+            "id": notification_id,
+            "recipient_id": n.recipient_id,
+            "type": n.type,
+            "message": n.message,
+            "link": n.link,
+            "is_read": False,
+            "created_at": created_at.isoformat(),
+        },
+    }
+
 def create_notification(db: Session, notification: NotificationCreate):
     db_notification = Notification(
         recipient_id=notification.recipient_id,
@@ -10,20 +52,224 @@ def create_notification(db: Session, notification: NotificationCreate):
         link=notification.link
     )
     db.add(db_notification)
+    adjust_unread_counts(db, {notification.recipient_id: 1})
+    db.flush()
+    _queue_events(db, [(notification.recipient_id, _notification_event(notification, db_notification.created_at, db_notification.id))])
     db.commit()
     db.refresh(db_notification)
     return db_notification
 
+def adjust_unread_counts(db: Session, deltas: dict):
+    """Applies {user_id: delta} to the unread counters in the caller's transaction."""
+    adjust_counters(db, NotificationUnreadCount.unread_count, NotificationUnreadCount.user_id, deltas)
+
+def rebuild_unread_counts(db: Session) -> int:
+    """Recomputes every unread counter from the notifications table."""
+    db.query(NotificationUnreadCount).delete(synchronize_session=False)
+    rows = db.query(Notification.recipient_id, func.count(Notification.id)).filter(
+        Notification.is_read == False
+    ).group_by(Notification.recipient_id).all()
+    if rows:
+        db.execute(insert(NotificationUnreadCount).values([
+            {"user_id": user_id, "unread_count": count} for user_id, count in rows
+        ]))
+    db.commit()
+    return len(rows)
+
+def ensure_unread_counts(db: Session):
+    """Backfills the counters once when the table is new but unread notifications exist."""
+    if db.query(NotificationUnreadCount.user_id).first() is None and \
+            db.query(Notification.id).filter(Notification.is_read == False).first() is not None:
+        rebuild_unread_counts(db)
+
+def _inserted_ids(db: Session, stmt, notifications: List[NotificationCreate], created_at: datetime) -> List[int]:
+    """
+    Runs the multi-row INSERT and returns the new ids in the order of
+    `notifications`. Uses RETURNING where the dialect supports it, otherwise
+    re-selects the rows just written (same recipients, same created_at).
+    """
+    if db.get_bind().dialect.full_returning:
+        rows = db.execute(stmt.returning(Notification.id, Notification.recipient_id)).all()
+    else:
+        db.execute(stmt)
+        rows = db.query(Notification.id, Notification.recipient_id).filter(
+            Notification.recipient_id.in_({n.recipient_id for n in notifications}),
+            Notification.created_at == created_at
+        ).all()
+    # A multi-row INSERT assigns ascending ids in VALUES order
+    ids_by_recipient = {}
+    for notification_id, recipient_id in sorted(rows):
+        ids_by_recipient.setdefault(recipient_id, []).append(notification_id)
+    return [ids_by_recipient[n.recipient_id].pop(0) for n in notifications]
+
+def insert_notifications(db: Session, notifications: List[NotificationCreate]):
+    """Adds a single multi-row INSERT for the notifications to the current transaction."""
+    if not notifications:
+        return
+    now = datetime.utcnow()
+    stmt = insert(Notification).values([
+        {
+            "recipient_id": n.recipient_id,
+            "type": n.type,
+            "message": n.message,
+            "link": n.link,
+            "is_read": False,
+            "created_at": now,
+        }
+        for n in notifications
+    ])
+    ids = _inserted_ids(db, stmt, notifications, now)
+    adjust_unread_counts(db, Counter(n.recipient_id for n in notifications))
+    _queue_events(db, [
+        (n.recipient_id, _notification_event(n, now, notification_id))
+        for n, notification_id in zip(notifications, ids)
+    ])
+
+def enqueue_notifications(db: Session, notifications: List[NotificationCreate]):
+    """
+    Queues notification intents in the outbox without committing, so they
+    commit atomically with the caller's own write. The background
+    dispatcher delivers them later.
+    """
+    stmt = outbox_insert_statement(notifications)
+    if stmt is not None:
+        db.execute(stmt)
+
+def outbox_insert_statement(notifications: List[NotificationCreate]):
+    if not notifications:
+        return None
+    now = datetime.utcnow()
+    return insert(NotificationOutbox).values([
+        {
+            "recipient_id": n.recipient_id,
+            "type": n.type,
+            "message": n.message,
+            "link": n.link,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        }
+        for n in notifications
+    ])
+
+def _outbox_to_create(row: NotificationOutbox) -> NotificationCreate:
+    return NotificationCreate(recipient_id=row.recipient_id, type=row.type, message=row.message, link=row.link)
+
+def _mark_outbox_failed(db: Session, rows: List[NotificationOutbox], error: Exception):
+    now = datetime.utcnow()
+    for row in rows:
+        row.attempts += 1
+        row.last_error = f"{type(error).__name__}: {error}"
+        row.next_attempt_at = now + timedelta(seconds=2 ** row.attempts)
+    db.commit()
+
+def drain_outbox(db: Session, batch_size: int = 100) -> dict:
+    """
+    Delivers up to batch_size due outbox entries as notifications and
+    deletes them, in one transaction. If the batch fails, entries are
+    retried one by one so a single bad row can't block the queue; failed
+    rows back off exponentially until OUTBOX_MAX_ATTEMPTS.
+    """
+    rows = db.query(NotificationOutbox).filter(
+        NotificationOutbox.attempts < OUTBOX_MAX_ATTEMPTS,
+        NotificationOutbox.next_attempt_at <= datetime.utcnow()
+    ).order_by(NotificationOutbox.id).limit(batch_size).with_for_update(skip_locked=True).all()
+    if not rows:
+        return {"delivered": 0, "failed": 0}
+
+    try:
+        insert_notifications(db, [_outbox_to_create(r) for r in rows])
+        for row in rows:
+            db.delete(row)
+        db.commit()
+        return {"delivered": len(rows), "failed": 0}
+    except SQLAlchemyError:
+        db.rollback()
+
+    delivered = failed = 0
+    for row in rows:
+        try:
+            insert_notifications(db, [_outbox_to_create(row)])
+            db.delete(row)
+            db.commit()
+            delivered += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            _mark_outbox_failed(db, [row], e)
+            failed += 1
+    return {"delivered": delivered, "failed": failed}
+
+def get_outbox_depth(db: Session) -> dict:
+    """Returns the number of queued and dead-lettered outbox entries."""
+    pending, dead = db.query(
+        func.count(NotificationOutbox.id).filter(NotificationOutbox.attempts < OUTBOX_MAX_ATTEMPTS),
+        func.count(NotificationOutbox.id).filter(NotificationOutbox.attempts >= OUTBOX_MAX_ATTEMPTS),
+    ).one()
+    return {"pending": pending, "dead": dead}
+
 def get_my_notifications(db: Session, user_id: int):
     return db.query(Notification).filter(Notification.recipient_id == user_id).order_by(Notification.created_at.desc()).all()
 
+def notifications_page_statement(user_id: int, limit: int, cursor: str = None):
+    stmt = select(Notification).where(Notification.recipient_id == user_id)
+    if cursor:
+        created_at, notification_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Notification.created_at < created_at,
+            and_(Notification.created_at == created_at, Notification.id < notification_id)
+        ))
+    return stmt.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
+
+def notifications_page(rows, limit: int) -> dict:
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+def get_notifications_page(db: Session, user_id: int, limit: int = 20, cursor: str = None):
+    """One page of the inbox, newest first, keyed on (created_at, id)."""
+    rows = db.execute(notifications_page_statement(user_id, limit, cursor)).scalars().all()
+    return notifications_page(rows, limit)
+
+def mark_read_statement(user_id: int, ids: List[int] = None, before: datetime = None, notification_id: int = None):
+    """UPDATE marking the user's matching unread notifications as read."""
+    stmt = update(Notification).where(Notification.recipient_id == user_id, Notification.is_read == False)
+    if ids is not None:
+        stmt = stmt.where(Notification.id.in_(ids))
+    if before is not None:
+        stmt = stmt.where(Notification.created_at <= before)
+    if notification_id is not None:
+        stmt = stmt.where(Notification.id == notification_id)
+    return stmt.values(is_read=True).execution_options(synchronize_session=False)
+
+def mark_many_as_read(db: Session, user_id: int, ids: List[int] = None, before: datetime = None) -> int:
+    """
+    Marks the given ids, everything created at or before `before`, or (with
+    neither) the whole inbox as read in one UPDATE. Returns rows changed.
+    """
+    if ids is not None and not ids:
+        return 0
+    updated = db.execute(mark_read_statement(user_id, ids, before)).rowcount
+    if updated:
+        adjust_unread_counts(db, {user_id: -updated})
+        _queue_events(db, [(user_id, {"event": "read"})])
+    db.commit()
+    return updated
+
 def mark_as_read(db: Session, notification_id: int, user_id: int):
     db_notification = db.query(Notification).filter(Notification.id == notification_id, Notification.recipient_id == user_id).first()
     if db_notification:
-        db_notification.is_read = True
-        db.commit()
+        # Conditional UPDATE so concurrent reads of the same item decrement once
+        updated = db.execute(mark_read_statement(user_id, notification_id=notification_id)).rowcount
+        if updated:
+            adjust_unread_counts(db, {user_id: -updated})
+            _queue_events(db, [(user_id, {"event": "read"})])
+            db.commit()
         db.refresh(db_notification)
     return db_notification
 
+def unread_count_statement(user_id: int):
+    return select(NotificationUnreadCount.unread_count).where(NotificationUnreadCount.user_id == user_id)
+
 def get_unread_count(db: Session, user_id: int):
-    return db.query(Notification).filter(Notification.recipient_id == user_id, Notification.is_read == False).count()
+    count = db.execute(unread_count_statement(user_id)).scalar()
+    return max(count or 0, 0)
@@ -0,0 +1,196 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from src.auth.service import decode_token
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1").lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`limit` requests per `period` seconds, refilled continuously (token bucket)."""
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parses "10/60" (10 requests per 60 seconds)."""
+        try:
+            limit, period = spec.split("/")
+            return cls(int(limit), float(period))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit {spec!r}; expected '<requests>/<seconds>'")
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    per_user: Optional[RateLimit]
+    per_ip: Optional[RateLimit]
+    # JSON body field identifying the caller on unauthenticated routes (e.g. login email)
+    body_key: Optional[str] = None
+
+
+def _policy(name: str, per_user: str, per_ip: str, body_key: str = None) -> RateLimitPolicy:
+    """Builds a policy; RATE_LIMIT_<NAME>_USER / _IP override the defaults, "off" disables one."""
+    def limit(scope: str, default: str) -> Optional[RateLimit]:
+        spec = os.getenv(f"RATE_LIMIT_{name.upper()}_{scope}", default)
+        return None if spec.lower() == "off" else RateLimit.parse(spec)
+
+    return RateLimitPolicy(name, limit("USER", per_user), limit("IP", per_ip), body_key)
+
+
+POLICIES = {
+    "reactions": _policy("reactions", "60/60", "300/60"),
+    "comments": _policy("comments", "10/60", "60/60"),
+    "reports": _policy("reports", "5/300", "30/300"),
+    "login": _policy("login", "5/60", "30/60", body_key="email"),
+}
+
+
+class TokenBucketLimiter:
+    """
+    Thread-safe token buckets in a bounded LRU map. Each check touches a
+    fixed number of buckets and evicts at most a few idle ones, so it is
+    O(1). A bucket idle for a full period has refilled completely, so
+    dropping it loses nothing; least recently used buckets go first when
+    maxsize is reached.
+    """
+
+    EVICTIONS_PER_CHECK = 8
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at, idle_after]
+        self._lock = threading.Lock()
+
+    def _evict_idle(self, now: float):
+        for _ in range(self.EVICTIONS_PER_CHECK):
+            if not self._buckets:
+                return
+            key, bucket = next(iter(self._buckets.items()))
+            if bucket[1] + bucket[2] > now:
+                return
+            del self._buckets[key]
+            self.evictions += 1
+
+    def acquire(self, checks) -> float:
+        """
+        Takes one token from every (key, RateLimit) bucket, or from none if
+        any is empty. Returns 0 when allowed, else seconds until a retry
+        can succeed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            levels = []
+            for key, rule in checks:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    tokens = float(rule.limit)
+                else:
+                    tokens = min(rule.limit, bucket[0] + (now - bucket[1]) * rule.limit / rule.period)
+                levels.append((key, rule, tokens))
+
+            retry_after = max(
+                ((1 - tokens) * rule.period / rule.limit for _, rule, tokens in levels if tokens < 1),
+                default=0.0,
+            )
+            taken = 0 if retry_after else 1
+            for key, rule, tokens in levels:
+                self._buckets[key] = [tokens - taken, now, rule.period]
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+
+            if retry_after:
+                self.limited += 1
+            else:
+                self.allowed += 1
+            return retry_after
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": RATE_LIMIT_ENABLED,
+                "buckets": len(self._buckets),
+                "maxsize": self.maxsize,
+                "allowed": self.allowed,
+                "limited": self.limited,
+                "evictions": self.evictions,
+                "policies": {
+                    name: {
+                        "per_user": f"{p.per_user.limit}/{p.per_user.period:g}" if p.per_user else None,
+                        "per_ip": f"{p.per_ip.limit}/{p.per_ip.period:g}" if p.per_ip else None,
+                    }
+                    for name, p in POLICIES.items()
+                },
+            }
+
+
+limiter = TokenBucketLimiter(maxsize=int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")))
+
+
+async def _caller_key(request: Request, policy: RateLimitPolicy) -> Optional[str]:
+    """The bearer token's user, else a user_id/reporter_id query parameter, else the policy's body field."""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            user_id = decode_token(authorization[7:]).get("user_id")
+            if user_id is not None:
+                return f"user:{user_id}"
+        except HTTPException:
+            pass
+    for param in ("user_id", "reporter_id"):
+        if request.query_params.get(param):
+            return f"user:{request.query_params[param]}"
+    if policy.body_key:
+        try:
+            value = (await request.json()).get(policy.body_key)
+        except Exception:
+            value = None
+        if value:
+            return f"{policy.body_key}:{str(value).strip().lower()}"
+    return None
+
+
+def rate_limit(policy_name: str):
+    """
+    FastAPI dependency enforcing the named policy per caller and per client
+    IP. Over-limit requests get 429 with Retry-After.
+
+        @router.post("/...", dependencies=[Depends(rate_limit("comments"))])
+    """
+    policy = POLICIES[policy_name]
+
+    async def check_rate_limit(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+        checks = []
+        if policy.per_ip:
+            ip = request.client.host if request.client else "unknown"
+            checks.append((f"{policy.name}|ip:{ip}", policy.per_ip))
+        if policy.per_user:
+            caller = await _caller_key(request, policy)
+            if caller:
+                checks.append((f"{policy.name}|{caller}", policy.per_user))
+        retry_after = limiter.acquire(checks)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    return check_rate_limit
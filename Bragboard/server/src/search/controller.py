@@ -0,0 +1,25 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from src.database.replica import get_read_db, read_cache_key
+from src.cache import response_cache
+from src.search import service
+from src.search.models import SearchPage
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("", response_model=SearchPage)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match in titles, messages, tags and comments"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    """Ranked full-text search over shoutouts; snippets wrap matches in <mark> tags."""
+    try:
+        return response_cache.get_or_set(
+            read_cache_key(db, "search", q, limit, cursor),
+            lambda: SearchPage.model_validate(service.search_shoutouts(db, q, limit, cursor))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,20 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from src.users.models import UserRead
+from src.todos.models import TagRead
+
+class SearchHit(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    snippet: str
+    rank: float  # lower is a better match
+    sender: UserRead
+    tags: List[TagRead] = []
+    created_at: datetime
+
+class SearchPage(BaseModel):
+    items: List[SearchHit] = []
+    next_cursor: Optional[str] = None
@@ -0,0 +1,222 @@
+import re
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.orm import Session, joinedload, selectinload
+from src.entities.todo import Shoutout, Comment, Tag, shoutout_tag_table
+from src.pagination import encode_score_cursor, decode_score_cursor
+
+# Full-text index over shoutouts: one document per shoutout holding its
+# title, message, tag names and comment text. SQLite uses an FTS5 virtual
+# table keyed by rowid = shoutout id; Postgres a table with a weighted
+# tsvector and a GIN index. Neither fits Base.metadata, so the DDL is here.
+SEARCH_TABLE = "shoutout_search"
+SEARCH_COLUMNS = ("title", "message", "tags", "comments")
+MAX_QUERY_TERMS = 8
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_TOKENS = 16
+REINDEX_CHUNK_SIZE = 500
+
+# Column weights, in SEARCH_COLUMNS order: title > tags > message > comments
+SQLITE_BM25_WEIGHTS = "10.0, 2.0, 5.0, 1.0"
+POSTGRES_WEIGHTS = {"title": "A", "message": "C", "tags": "B", "comments": "D"}
+
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def ensure_search_index(db: Session):
+    """Creates the search index on first run and fills it from existing shoutouts."""
+    dialect = _dialect(db)
+    if dialect == "sqlite":
+        exists = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": SEARCH_TABLE}
+        ).first()
+        if exists:
+            return
+        db.execute(text(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            f"{', '.join(SEARCH_COLUMNS)}, tokenize='unicode61 remove_diacritics 2')"
+        ))
+    elif dialect == "postgresql":
+        if db.execute(text("SELECT to_regclass(:name)"), {"name": SEARCH_TABLE}).scalar():
+            return
+        db.execute(text(
+            f"CREATE TABLE {SEARCH_TABLE} ("
+            "shoutout_id INTEGER PRIMARY KEY REFERENCES shoutouts(id) ON DELETE CASCADE, "
+            + "".join(f"{column} TEXT NOT NULL, " for column in SEARCH_COLUMNS)
+            + "document TSVECTOR NOT NULL)"
+        ))
+        db.execute(text(f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)"))
+    else:
+        return
+    rebuild_search_index(db)
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Re-indexes every shoutout in chunks and commits. Returns the number indexed."""
+    indexed = 0
+    last_id = 0
+    while True:
+        ids = db.execute(
+            select(Shoutout.id).where(Shoutout.id > last_id).order_by(Shoutout.id).limit(REINDEX_CHUNK_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+        index_shoutouts(db, ids)
+        indexed += len(ids)
+        last_id = ids[-1]
+    db.commit()
+    return indexed
+
+
+def _documents(db: Session, shoutout_ids) -> dict:
+    docs = {
+        sid: {"shoutout_id": sid, "title": title, "message": message, "tags": [], "comments": []}
+        for sid, title, message in db.execute(
+            select(Shoutout.id, Shoutout.title, Shoutout.message).where(Shoutout.id.in_(shoutout_ids))
+        )
+    }
+    if not docs:
+        return docs
+    tags = db.execute(
+        select(shoutout_tag_table.c.shoutout_id, Tag.name)
+        .join(Tag, Tag.id == shoutout_tag_table.c.tag_id)
+        .where(shoutout_tag_table.c.shoutout_id.in_(docs))
+    )
+    for sid, name in tags:
+        docs[sid]["tags"].append(name)
+    comments = db.execute(
+        select(Comment.shoutout_id, Comment.content).where(Comment.shoutout_id.in_(docs)).order_by(Comment.id)
+    )
+    for sid, content in comments:
+        docs[sid]["comments"].append(content)
+    for doc in docs.values():
+        doc["tags"] = " ".join(doc["tags"])
+        doc["comments"] = "\n".join(doc["comments"])
+    return docs
+
+
+def index_shoutouts(db: Session, shoutout_ids):
+    """
+    Rewrites the index documents for the given shoutouts from their current
+    rows, without committing; ids that no longer exist are dropped. Call it
+    inside the transaction that changed them.
+    """
+    shoutout_ids = list(set(shoutout_ids))
+    dialect = _dialect(db)
+    if not shoutout_ids or dialect not in ("sqlite", "postgresql"):
+        return
+    db.flush()
+    docs = _documents(db, shoutout_ids)
+
+    key = "rowid" if dialect == "sqlite" else "shoutout_id"
+    db.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE {key} IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": shoutout_ids},
+    )
+    if not docs:
+        return
+    columns = ", ".join(SEARCH_COLUMNS)
+    values = ", ".join(f":{column}" for column in SEARCH_COLUMNS)
+    if dialect == "sqlite":
+        insert = f"INSERT INTO {SEARCH_TABLE} (rowid, {columns}) VALUES (:shoutout_id, {values})"
+    else:
+        document = " || ".join(
+            f"setweight(to_tsvector('english', :{column}), '{weight}')"
+            for column, weight in POSTGRES_WEIGHTS.items()
+        )
+        insert = f"INSERT INTO {SEARCH_TABLE} (shoutout_id, {columns}, document) VALUES (:shoutout_id, {values}, {document})"
+    db.execute(text(insert), list(docs.values()))
+
+
+def _query_terms(q: str):
+    terms = re.findall(r"\w+", q.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    return terms
+
+
+def _ranked_sql(dialect: str) -> str:
+    """
+    Matching shoutout ids with a rank (lower is better) and a highlighted
+    snippet, after the keyset cursor, joined to shoutouts so index rows of
+    deleted shoutouts never surface.
+    """
+    after = "(:after_rank IS NULL OR ranked.rank > :after_rank OR (ranked.rank = :after_rank AND ranked.shoutout_id > :after_id))"
+    if dialect == "sqlite":
+        return f"""
+            SELECT ranked.shoutout_id, ranked.rank, ranked.snippet FROM (
+                SELECT rowid AS shoutout_id,
+                       bm25({SEARCH_TABLE}, {SQLITE_BM25_WEIGHTS}) AS rank,
+                       snippet({SEARCH_TABLE}, -1, :hl_start, :hl_end, '…', {SNIPPET_TOKENS}) AS snippet
+                FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query
+            ) AS ranked
+            JOIN shoutouts ON shoutouts.id = ranked.shoutout_id
+            WHERE {after}
+            ORDER BY ranked.rank, ranked.shoutout_id
+            LIMIT :limit
+        """
+    return f"""
+        SELECT ranked.shoutout_id, ranked.rank,
+               ts_headline('english', ranked.title || ' ' || ranked.message || ' ' || ranked.comments, ranked.q,
+                           'StartSel=' || :hl_start || ', StopSel=' || :hl_end || ', MaxWords={SNIPPET_TOKENS}, MinWords=4') AS snippet
+        FROM (
+            SELECT d.shoutout_id, d.title, d.message, d.comments, q, -ts_rank_cd(d.document, q) AS rank
+            FROM {SEARCH_TABLE} d, to_tsquery('english', :query) q
+            WHERE d.document @@ q
+        ) AS ranked
+        JOIN shoutouts ON shoutouts.id = ranked.shoutout_id
+        WHERE {after}
+        ORDER BY ranked.rank, ranked.shoutout_id
+        LIMIT :limit
+    """
+
+
+def search_shoutouts(db: Session, q: str, limit: int = 20, cursor: str = None):
+    """
+    One page of shoutouts matching every word of `q` (the last word also
+    as a prefix), best match first, keyed on (rank, id).
+    """
+    dialect = _dialect(db)
+    if dialect not in ("sqlite", "postgresql"):
+        raise ValueError(f"Search is not supported on {dialect}")
+    terms = _query_terms(q)
+    if dialect == "sqlite":
+        query = " ".join(f'"{t}"' for t in terms[:-1]) + f' "{terms[-1]}"*'
+    else:
+        query = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    after_rank, after_id = decode_score_cursor(cursor) if cursor else (None, None)
+
+    rows = db.execute(text(_ranked_sql(dialect)), {
+        "query": query.strip(),
+        "hl_start": HIGHLIGHT_START,
+        "hl_end": HIGHLIGHT_END,
+        "after_rank": after_rank,
+        "after_id": after_id,
+        "limit": limit + 1,
+    }).all()
+
+    page = rows[:limit]
+    shouts = {
+        s.id: s
+        for s in db.execute(
+            select(Shoutout)
+            .options(joinedload(Shoutout.sender), selectinload(Shoutout.tags))
+            .where(Shoutout.id.in_([row.shoutout_id for row in page]))
+        ).scalars()
+    }
+    items = [
+        {
+            "id": row.shoutout_id,
+            "title": shouts[row.shoutout_id].title,
+            "snippet": row.snippet,
+            "rank": row.rank,
+            "sender": shouts[row.shoutout_id].sender,
+            "tags": shouts[row.shoutout_id].tags,
+            "created_at": shouts[row.shoutout_id].created_at,
+        }
+        for row in page
+    ]
+    next_cursor = encode_score_cursor(page[-1].rank, page[-1].shoutout_id) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import StreamingResponse, Response, FileResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from typing import Optional, List, Literal
 from datetime import datetime
 import io
 from src.database.core import get_db
-from src.entities.user import User
-from . import service
+from src.auth.service import Principal, load_principal
+from src.rate_limiter import rate_limit
+from . import service, export_jobs
 from .models import (
     ShoutoutReportCreate,
     ShoutoutReportRead,
@@ -14,16 +15,17 @@ from .models import (
     ReportStatus,
     CommentReportCreate,
     CommentReportRead,
-    CommentReportResolve
+    CommentReportResolve,
+    ExportJobRead
 )
 
 router = APIRouter(prefix="/api/shoutout-reports", tags=["Shoutout Reports"])
 comment_router = APIRouter(prefix="/api/comment-reports", tags=["Comment Reports"])
 
 
-def verify_user(db: Session, user_id: int) -> User:
-    """Helper to verify user exists."""
-    user = db.get(User, user_id)
+def verify_user(db: Session, user_id: int) -> Principal:
+    """Helper to verify user exists. Served from the principal cache."""
+    user = load_principal(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -32,7 +34,7 @@ def verify_user(db: Session, user_id: int) -> User:
     return user
 
 
-def verify_admin(db: Session, admin_id: int) -> User:
+def verify_admin(db: Session, admin_id: int) -> Principal:
     """Helper to verify admin exists and has admin role."""
     user = verify_user(db, admin_id)
     if user.role != "admin":
@@ -43,7 +45,8 @@ def verify_admin(db: Session, admin_id: int) -> User:
     return user
 
 
-@router.post("", response_model=ShoutoutReportRead, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=ShoutoutReportRead, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(rate_limit("reports"))])
 def create_report(
     payload: ShoutoutReportCreate,
     reporter_id: int = Query(..., ge=1, description="ID of the employee reporting the shoutout"),
@@ -76,7 +79,7 @@ def get_my_reports(
     """
     verify_user(db, reporter_id)
     reports = service.get_reports_by_reporter(db, reporter_id)
-    return [ShoutoutReportRead(**service.to_report_read(db, report)) for report in reports]
+    return [ShoutoutReportRead(**read) for read in service.to_report_reads(db, reports)]
 
 
 @router.get("", response_model=List[ShoutoutReportRead])
@@ -92,7 +95,7 @@ def get_all_reports(
     verify_admin(db, admin_id)
     status_str = status.value if status else None
     reports = service.get_all_reports(db, status_str)
-    return [ShoutoutReportRead(**service.to_report_read(db, report)) for report in reports]
+    return [ShoutoutReportRead(**read) for read in service.to_report_reads(db, reports)]
 
 
 @router.get("/{report_id}", response_model=ShoutoutReportRead)
@@ -105,8 +108,7 @@ def get_report(
     Get a specific report by ID.
     Employees can view their own reports, admins can view any report.
     """
-    verify_user(db, user_id)
-    user = db.get(User, user_id)
+    user = verify_user(db, user_id)
     report = service.get_report(db, report_id)
     
     if not report:
@@ -152,6 +154,9 @@ def resolve_report(
 def export_reports(
     file_format: Literal["csv", "pdf"],
     admin_id: int = Query(..., ge=1, description="ID of the admin user"),
+    status: Optional[ReportStatus] = Query(None, description="Only export reports with this status"),
+    start_date: Optional[datetime] = Query(None, description="Only export reports created at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only export reports created before this time"),
     db: Session = Depends(get_db)
 ):
     """
@@ -160,45 +165,114 @@ def export_reports(
     """
     verify_admin(db, admin_id)
     
-    
-    report_data = service.get_all_reports_for_export(db)
-    
-    if not report_data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No reports found to export")
+    status_str = status.value if status else None
+    if not service.has_reports_for_export(db, status_str, start_date, end_date):
+        raise HTTPException(status_code=404, detail="No reports found to export")
 
     
     filename_base = f"shoutout_moderation_report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
 
     if file_format == "csv":
         
-        csv_file = service.generate_reports_csv(report_data)
-        
-        
+        # Rows are read in chunks and written out as they are produced
         headers = {'Content-Disposition': f'attachment; filename="{filename_base}.csv"'}
         return StreamingResponse(
-            iter([csv_file.getvalue()]), 
+            service.stream_reports_csv_export(status_str, start_date, end_date), 
             media_type="text/csv", 
             headers=headers
         )
     
     elif file_format == "pdf":
         
-        pdf_buffer = service.generate_reports_pdf(report_data)
+        # Serve the cached artifact when the reports haven't changed; otherwise
+        # render it in the background and send the client to poll the job
+        job = export_jobs.submit_pdf_export(db, status_str, start_date, end_date)
+        if job["status"] != "done":
+            return RedirectResponse(
+                f"{router.prefix}/export/pdf/jobs/{job['job_id']}?admin_id={admin_id}",
+                status_code=303
+            )
 
-        
-        headers = {'Content-Disposition': f'attachment; filename="{filename_base}.pdf"'}
-        return Response(
-            content=pdf_buffer.getvalue(), 
-            media_type="application/pdf", 
-            headers=headers
+        return FileResponse(
+            job["path"],
+            media_type="application/pdf",
+            filename=f"{filename_base}.pdf"
         )
     
-    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file format requested")
+    raise HTTPException(status_code=400, detail="Invalid file format requested")
+
+
+def _to_export_job_read(job: dict) -> ExportJobRead:
+    download_url = None
+    if job["status"] == "done":
+        download_url = f"{router.prefix}/export/pdf/jobs/{job['job_id']}/download"
+    return ExportJobRead(
+        job_id=job["job_id"],
+        status=job["status"],
+        error=job["error"],
+        created_at=job["created_at"],
+        finished_at=job["finished_at"],
+        download_url=download_url
+    )
+
+
+@router.post("/export/pdf/jobs", response_model=ExportJobRead, status_code=202)
+def submit_pdf_export_job(
+    admin_id: int = Query(..., ge=1, description="ID of the admin user"),
+    status: Optional[ReportStatus] = Query(None, description="Only export reports with this status"),
+    start_date: Optional[datetime] = Query(None, description="Only export reports created at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only export reports created before this time"),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue a PDF export rendered in a background process (Admin endpoint).
+    Poll the returned job, then download it once its status is 'done'.
+    """
+    verify_admin(db, admin_id)
+    job = export_jobs.submit_pdf_export(db, status.value if status else None, start_date, end_date)
+    return _to_export_job_read(job)
+
+
+def _get_export_job(job_id: str) -> dict:
+    job = export_jobs.get_pdf_export(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+@router.get("/export/pdf/jobs/{job_id}", response_model=ExportJobRead)
+def get_pdf_export_job(
+    job_id: str,
+    admin_id: int = Query(..., ge=1, description="ID of the admin user"),
+    db: Session = Depends(get_db)
+):
+    """Poll the status of a PDF export job (Admin endpoint)."""
+    verify_admin(db, admin_id)
+    return _to_export_job_read(_get_export_job(job_id))
+
+
+@router.get("/export/pdf/jobs/{job_id}/download")
+def download_pdf_export_job(
+    job_id: str,
+    admin_id: int = Query(..., ge=1, description="ID of the admin user"),
+    db: Session = Depends(get_db)
+):
+    """Download the PDF produced by a finished export job (Admin endpoint)."""
+    verify_admin(db, admin_id)
+    job = _get_export_job(job_id)
+    if job["status"] != "done" or not job["path"].exists():
+        raise HTTPException(status_code=409, detail=f"Export job is {job['status']}")
+    return FileResponse(
+        job["path"],
+        media_type="application/pdf",
+        filename=f"shoutout_moderation_report_{job['created_at'].strftime('%Y%m%d_%H%M%S')}.pdf"
+    )
 
 
 # --- Comment Reporting Endpoints ---
 
-@comment_router.post("", response_model=CommentReportRead, status_code=status.HTTP_201_CREATED)
+@comment_router.post("", response_model=CommentReportRead, status_code=status.HTTP_201_CREATED,
+                     dependencies=[Depends(rate_limit("reports"))])
 def create_comment_report_endpoint(
     payload: CommentReportCreate,
     reporter_id: int = Query(..., ge=1, description="ID of the employee"),
@@ -221,7 +295,7 @@ def get_my_comment_reports_endpoint(
 ):
     verify_user(db, reporter_id)
     reports = service.get_comment_reports_by_reporter(db, reporter_id)
-    return [CommentReportRead(**service.to_comment_report_read(db, r)) for r in reports]
+    return [CommentReportRead(**read) for read in service.to_comment_report_reads(db, reports)]
 
 @comment_router.get("", response_model=List[CommentReportRead])
 def get_all_comment_reports_endpoint(
@@ -231,7 +305,7 @@ def get_all_comment_reports_endpoint(
 ):
     verify_admin(db, admin_id)
     reports = service.get_all_comment_reports(db, status)
-    return [CommentReportRead(**service.to_comment_report_read(db, r)) for r in reports]
+    return [CommentReportRead(**read) for read in service.to_comment_report_reads(db, reports)]
 
 @comment_router.patch("/{report_id}/resolve", response_model=CommentReportRead)
 def resolve_comment_report_endpoint(
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.database.core import DATA_DIR, SessionLocal
+from src.entities.shoutout_report import ShoutoutReport
+from src.entities.todo import Shoutout
+from . import service
+
+EXPORT_DIR = Path(os.getenv("REPORT_EXPORT_DIR", DATA_DIR / "exports"))
+EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+JOB_RETENTION = timedelta(hours=1)
+# Artifacts for superseded watermarks are never requested again
+ARTIFACT_RETENTION = timedelta(hours=int(os.getenv("REPORT_EXPORT_RETENTION_HOURS", "24")))
+
+_render_pool = None
+_pool_lock = threading.Lock()
+# Fetches rows and waits on the render pool, off the request threadpool
+_job_runner = ThreadPoolExecutor(max_workers=PDF_RENDER_WORKERS, thread_name_prefix="pdf-export")
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    with _pool_lock:
+        if _render_pool is None:
+            # spawn avoids forking a process that holds DB connections and threads
+            _render_pool = ProcessPoolExecutor(
+                max_workers=PDF_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _render_pool
+
+
+def render_pdf_to_file(data, path: str) -> str:
+    """Renders report rows to `path` atomically. Runs in a worker process."""
+    buffer = service.generate_reports_pdf(data)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp_path, path)
+    return path
+
+
+def report_watermark(db: Session, status: Optional[str], start: Optional[datetime], end: Optional[datetime]) -> list:
+    """
+    One aggregate over the filtered reports and their shoutouts. It changes
+    when a report is added, removed or resolved, or a reported shoutout is
+    edited. User renames don't show here; they clear the artifacts through
+    invalidate_cached_exports().
+    """
+    query = db.query(
+        func.count(ShoutoutReport.id),
+        func.max(ShoutoutReport.id),
+        func.max(ShoutoutReport.created_at),
+        func.max(ShoutoutReport.resolved_at),
+        func.max(Shoutout.updated_at),
+    ).join(Shoutout, ShoutoutReport.shoutout_id == Shoutout.id)
+    count, max_id, last_created, last_resolved, last_edited = service.filter_reports_for_export(query, status, start, end).one()
+    return [count, max_id, str(last_created), str(last_resolved), str(last_edited)]
+
+
+def export_cache_path(db: Session, status: Optional[str], start: Optional[datetime], end: Optional[datetime]) -> Path:
+    key = json.dumps({
+        "status": status,
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "watermark": report_watermark(db, status, start, end),
+    }, sort_keys=True)
+    return EXPORT_DIR / f"reports_{hashlib.sha256(key.encode()).hexdigest()[:32]}.pdf"
+
+
+def _run_job(job_id: str):
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job["status"] = "running"
+
+    db = SessionLocal()
+    try:
+        data = service.get_all_reports_for_export(db, job["filters"]["status"], job["filters"]["start"], job["filters"]["end"])
+        if not data:
+            raise ValueError("No reports found to export")
+        _get_render_pool().submit(render_pdf_to_file, data, str(job["path"])).result()
+        status, error = "done", None
+    except Exception as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+    finally:
+        db.close()
+
+    with _jobs_lock:
+        job.update(status=status, error=error, finished_at=datetime.utcnow())
+
+
+def _prune_jobs():
+    cutoff = datetime.utcnow() - JOB_RETENTION
+    for job_id, job in list(_jobs.items()):
+        if job["finished_at"] and job["finished_at"] < cutoff:
+            del _jobs[job_id]
+
+
+def invalidate_cached_exports():
+    """Drops every cached artifact; for changes the watermark can't see, such as user renames."""
+    for path in EXPORT_DIR.glob("reports_*.pdf"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _prune_artifacts():
+    cutoff = (datetime.utcnow() - ARTIFACT_RETENTION).timestamp()
+    for path in EXPORT_DIR.glob("reports_*.pdf"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def submit_pdf_export(db: Session, status: Optional[str] = None, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> dict:
+    """
+    Registers a PDF export job. If the artifact for these filters and the
+    current watermark is already on disk the job is done immediately; if
+    an identical job is still running, that job is returned instead.
+    """
+    path = export_cache_path(db, status, start, end)
+    now = datetime.utcnow()
+    with _jobs_lock:
+        _prune_jobs()
+        for job in _jobs.values():
+            if job["path"] == path and job["status"] in ("queued", "running"):
+                return dict(job)
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "path": path,
+            "filters": {"status": status, "start": start, "end": end},
+            "error": None,
+            "created_at": now,
+            "finished_at": None,
+        }
+        if path.exists():
+            job.update(status="done", finished_at=now)
+        _jobs[job["job_id"]] = job
+
+    if job["status"] == "queued":
+        _prune_artifacts()
+        _job_runner.submit(_run_job, job["job_id"])
+    return dict(job)
+
+
+def get_pdf_export(job_id: str) -> Optional[dict]:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def shutdown():
+    _job_runner.shutdown(wait=False, cancel_futures=True)
+    with _pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
 
@@ -72,3 +72,12 @@ class CommentReportRead(BaseModel):
     comment_content: Optional[str] = None
     comment_author_id: Optional[int] = None
 
+
+
+class ExportJobRead(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "done", "failed"]
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
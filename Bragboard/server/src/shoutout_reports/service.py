@@ -1,6 +1,7 @@
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session, aliased
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator
 import io
 import csv
 
@@ -13,6 +14,8 @@ except ImportError:
 from src.entities.shoutout_report import ShoutoutReport, ReportStatus, CommentReport
 from src.entities.todo import Shoutout, Comment
 from src.entities.user import User
+from src.cache import response_cache
+from src.search.service import index_shoutouts
 from .models import ShoutoutReportCreate, ShoutoutReportResolve, CommentReportCreate, CommentReportResolve
 
 
@@ -49,23 +52,26 @@ def create_report(db: Session, reporter_id: int, payload: ShoutoutReportCreate)
     )
     
     db.add(report)
-    db.commit()
-    db.refresh(report)
 
-    # Notify Admins
+    # Notify Admins; the alerts commit atomically with the report
     from src.users.service import get_admin_users
-    from src.notifications.service import create_notification
+    from src.notifications.service import enqueue_notifications
+    from src.notifications.dispatcher import dispatcher
     from src.notifications.models import NotificationCreate
     
     admins = get_admin_users(db)
-    for admin in admins:
-        notif = NotificationCreate(
+    enqueue_notifications(db, [
+        NotificationCreate(
             recipient_id=admin.id,
             type="report",
             message=f"New Shoutout Report against shoutout #{payload.shoutout_id}",
             link="/admin/moderation"
         )
-        create_notification(db, notif)
+        for admin in admins
+    ])
+    db.commit()
+    dispatcher.wake()
+    db.refresh(report)
 
     return report
 
@@ -133,12 +139,10 @@ def resolve_report(db: Session, report_id: int, admin_id: int, payload: Shoutout
     report.resolved_by = admin_id
     report.resolved_at = datetime.utcnow()
     report.resolution_notes = payload.resolution_notes.strip() if payload.resolution_notes else None
-    
-    db.commit()
-    db.refresh(report)
 
-            # Notify reporter
-    from src.notifications.service import create_notification
+    # Notify reporter; the resolution and the notification commit together
+    from src.notifications.service import enqueue_notifications
+    from src.notifications.dispatcher import dispatcher
     from src.notifications.models import NotificationCreate
     
     notif = NotificationCreate(
@@ -147,63 +151,91 @@ def resolve_report(db: Session, report_id: int, admin_id: int, payload: Shoutout
         message=f"Your report against shoutout #{report.shoutout_id} has been resolved: {status_enum.value}",
         link=f"/my-reports"
     )
-    create_notification(db, notif)
+    enqueue_notifications(db, [notif])
+    db.commit()
+    dispatcher.wake()
+    db.refresh(report)
 
     return report
 
 
+def _user_names(db: Session, user_ids) -> Dict[int, str]:
+    """Loads names for all given user ids with a single IN query."""
+    user_ids = {uid for uid in user_ids if uid}
+    if not user_ids:
+        return {}
+    return dict(db.query(User.id, User.name).filter(User.id.in_(user_ids)).all())
+
+
+def to_report_reads(db: Session, reports: List[ShoutoutReport]) -> List[dict]:
+    """
+    Convert ShoutoutReport entities to dictionaries suitable for ShoutoutReportRead.
+    Referenced users and shoutouts are loaded with one IN query per entity type.
+    """
+    names = _user_names(db, [r.reporter_id for r in reports] + [r.resolved_by for r in reports])
+    shoutout_ids = {r.shoutout_id for r in reports}
+    shoutouts = {
+        row.id: row for row in db.query(Shoutout.id, Shoutout.message, Shoutout.sender_id).filter(
+            Shoutout.id.in_(shoutout_ids)
+        )
+    } if shoutout_ids else {}
+
+    reads = []
+    for report in reports:
+        shoutout = shoutouts.get(report.shoutout_id)
+        reads.append({
+            "id": report.id,
+            "shoutout_id": report.shoutout_id,
+            "reporter_id": report.reporter_id,
+            "reporter_name": names.get(report.reporter_id),
+            "reason": report.reason,
+            "description": report.description,
+            "status": report.status.value if isinstance(report.status, ReportStatus) else report.status,
+            "resolved_by": report.resolved_by,
+            "resolver_name": names.get(report.resolved_by) if report.resolved_by else None,
+            "resolved_at": report.resolved_at,
+            "resolution_notes": report.resolution_notes,
+            "created_at": report.created_at,
+            "shoutout_message": shoutout.message if shoutout else None,
+            "shoutout_sender_id": shoutout.sender_id if shoutout else None,
+        })
+    return reads
+
+
 def to_report_read(db: Session, report: ShoutoutReport) -> dict:
     """
     Convert a ShoutoutReport entity to a dictionary suitable for ShoutoutReportRead.
     """
-    
-    reporter = db.get(User, report.reporter_id)
-    reporter_name = reporter.name if reporter else None
-    
-    
-    resolver_name = None
-    if report.resolved_by:
-        resolver = db.get(User, report.resolved_by)
-        resolver_name = resolver.name if resolver else None
-    
-   
-    shoutout = db.get(Shoutout, report.shoutout_id)
-    shoutout_message = shoutout.message if shoutout else None
-    shoutout_sender_id = shoutout.sender_id if shoutout else None
-    
-    return {
-        "id": report.id,
-        "shoutout_id": report.shoutout_id,
-        "reporter_id": report.reporter_id,
-        "reporter_name": reporter_name,
-        "reason": report.reason,
-        "description": report.description,
-        "status": report.status.value if isinstance(report.status, ReportStatus) else report.status,
-        "resolved_by": report.resolved_by,
-        "resolver_name": resolver_name,
-        "resolved_at": report.resolved_at,
-        "resolution_notes": report.resolution_notes,
-        "created_at": report.created_at,
-        "shoutout_message": shoutout_message,
-        "shoutout_sender_id": shoutout_sender_id,
-    }
-
-
-def get_all_reports_for_export(db: Session) -> List[Dict[str, Any]]:
+    return to_report_reads(db, [report])[0]
+
+
+EXPORT_FIELDNAMES = [
+    "report_id", "status", "reason", "description", "created_at", "reporter_name",
+    "shoutout_message", "shoutout_sender_name", "resolved_by_name", "resolved_at", "resolution_notes",
+]
+
+
+def _export_query(db: Session, status: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None):
     """
-    Fetches all report data with necessary joined fields for export.
-    This uses aliases for clarity in joins on the User table.
+    Column-only query for report exports with status and date-range filters
+    applied in SQL. This uses aliases for clarity in joins on the User table.
     """
     Reporter = aliased(User)
     Resolver = aliased(User)
     ShoutoutSender = aliased(User)
 
     query = db.query(
-        ShoutoutReport,
-        Reporter,
-        Resolver,
-        Shoutout,
-        ShoutoutSender,
+        ShoutoutReport.id,
+        ShoutoutReport.status,
+        ShoutoutReport.reason,
+        ShoutoutReport.description,
+        ShoutoutReport.created_at,
+        Reporter.name.label("reporter_name"),
+        Shoutout.message.label("shoutout_message"),
+        ShoutoutSender.name.label("shoutout_sender_name"),
+        Resolver.name.label("resolved_by_name"),
+        ShoutoutReport.resolved_at,
+        ShoutoutReport.resolution_notes,
     ).join(
         Reporter, ShoutoutReport.reporter_id == Reporter.id
     ).join(
@@ -212,44 +244,96 @@ def get_all_reports_for_export(db: Session) -> List[Dict[str, Any]]:
         ShoutoutSender, Shoutout.sender_id == ShoutoutSender.id
     ).outerjoin(
         Resolver, ShoutoutReport.resolved_by == Resolver.id
-    ).order_by(ShoutoutReport.created_at.desc())
+    )
+    return filter_reports_for_export(query, status, start, end)
 
-    report_tuples = query.all()
 
-    def get_name(user_obj):
-        return user_obj.name if user_obj else None
+def filter_reports_for_export(query, status: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Applies the export's status and date-range filters to a query over ShoutoutReport."""
+    if status:
+        query = query.filter(ShoutoutReport.status == ReportStatus(status.lower()))
+    if start:
+        query = query.filter(ShoutoutReport.created_at >= start)
+    if end:
+        query = query.filter(ShoutoutReport.created_at < end)
+    return query
 
-    
-    data = []
-    for report, reporter, resolver, shoutout, sender in report_tuples:
-        data.append({
-            "report_id": report.id,
-            "status": report.status.value,
-            "reason": report.reason,
-            "description": report.description,
-            "created_at": report.created_at.isoformat(),
-            "reporter_name": get_name(reporter),
-            "shoutout_message": shoutout.message,
-            "shoutout_sender_name": get_name(sender),
-            "resolved_by_name": get_name(resolver),
-            "resolved_at": report.resolved_at.isoformat() if report.resolved_at else None,
-            "resolution_notes": report.resolution_notes,
-        })
-    return data
 
+def has_reports_for_export(db: Session, status: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None) -> bool:
+    return _export_query(db, status, start, end).first() is not None
 
-def generate_reports_csv(data: List[Dict[str, Any]]) -> io.StringIO:
-    """Generates CSV content from a list of report dictionaries."""
-    output = io.StringIO()
-    
-    fieldnames = list(data[0].keys()) if data else []
-    
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
+
+def iter_reports_for_export(db: Session, status: Optional[str] = None, start: Optional[datetime] = None,
+                            end: Optional[datetime] = None, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """
+    Yields export rows newest first, reading chunk_size rows per query with
+    keyset paging on (created_at, id) so memory stays constant.
+    """
+    base = _export_query(db, status, start, end)
+    last = None
+    while True:
+        query = base
+        if last:
+            query = query.filter(or_(
+                ShoutoutReport.created_at < last[0],
+                and_(ShoutoutReport.created_at == last[0], ShoutoutReport.id < last[1])
+            ))
+        rows = query.order_by(ShoutoutReport.created_at.desc(), ShoutoutReport.id.desc()).limit(chunk_size).all()
+        for row in rows:
+            yield {
+                "report_id": row.id,
+                "status": row.status.value,
+                "reason": row.reason,
+                "description": row.description,
+                "created_at": row.created_at.isoformat(),
+                "reporter_name": row.reporter_name,
+                "shoutout_message": row.shoutout_message,
+                "shoutout_sender_name": row.shoutout_sender_name,
+                "resolved_by_name": row.resolved_by_name,
+                "resolved_at": row.resolved_at.isoformat() if row.resolved_at else None,
+                "resolution_notes": row.resolution_notes,
+            }
+        if len(rows) < chunk_size:
+            return
+        last = (rows[-1].created_at, rows[-1].id)
+
+
+def get_all_reports_for_export(db: Session, status: Optional[str] = None, start: Optional[datetime] = None,
+                               end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Fetches all report data with necessary joined fields for export.
+    """
+    return list(iter_reports_for_export(db, status, start, end))
+
+
+def stream_reports_csv(rows: Iterable[Dict[str, Any]], rows_per_chunk: int = 500) -> Iterator[str]:
+    """Yields CSV text incrementally, flushing a small buffer every rows_per_chunk rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDNAMES)
     writer.writeheader()
-    writer.writerows(data)
-    
-    output.seek(0)
-    return output
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_reports_csv_export(status: Optional[str] = None, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None, chunk_size: int = 500) -> Iterator[str]:
+    """
+    Streams the CSV export using its own session. Request-scoped sessions
+    are closed before a StreamingResponse body is sent, so the generator
+    can't borrow one.
+    """
+    from src.database.core import SessionLocal
+    db = SessionLocal()
+    try:
+        yield from stream_reports_csv(iter_reports_for_export(db, status, start, end, chunk_size), chunk_size)
+    finally:
+        db.close()
 
 
 def generate_reports_pdf(data: List[Dict[str, Any]]) -> io.BytesIO:
@@ -325,23 +409,26 @@ def create_comment_report(db: Session, reporter_id: int, payload: CommentReportC
     )
     
     db.add(report)
-    db.commit()
-    db.refresh(report)
 
-    # Notify Admins
+    # Notify Admins; the alerts commit atomically with the report
     from src.users.service import get_admin_users
-    from src.notifications.service import create_notification
+    from src.notifications.service import enqueue_notifications
+    from src.notifications.dispatcher import dispatcher
     from src.notifications.models import NotificationCreate
     
     admins = get_admin_users(db)
-    for admin in admins:
-        notif = NotificationCreate(
+    enqueue_notifications(db, [
+        NotificationCreate(
             recipient_id=admin.id,
             type="report",
             message=f"New Comment Report against comment #{payload.comment_id}",
             link="/admin/moderation"
         )
-        create_notification(db, notif)
+        for admin in admins
+    ])
+    db.commit()
+    dispatcher.wake()
+    db.refresh(report)
 
     return report
 
@@ -390,12 +477,10 @@ def resolve_comment_report(db: Session, report_id: int, admin_id: int, payload:
     report.resolved_by = admin_id
     report.resolved_at = datetime.utcnow()
     report.resolution_notes = payload.resolution_notes.strip() if payload.resolution_notes else None
-    
-    db.commit()
-    db.refresh(report)
 
-    # Notify reporter
-    from src.notifications.service import create_notification
+    # Notify reporter; the resolution and the notification commit together
+    from src.notifications.service import enqueue_notifications
+    from src.notifications.dispatcher import dispatcher
     from src.notifications.models import NotificationCreate
     
     notif = NotificationCreate(
@@ -404,46 +489,56 @@ def resolve_comment_report(db: Session, report_id: int, admin_id: int, payload:
         message=f"Your report against comment #{report.comment_id} has been resolved: {status_enum.value}",
         link=f"/my-reports"
     )
-    create_notification(db, notif)
+    enqueue_notifications(db, [notif])
+    db.commit()
+    dispatcher.wake()
+    db.refresh(report)
 
     return report
 
 
+def to_comment_report_reads(db: Session, reports: List[CommentReport]) -> List[dict]:
+    """Convert CommentReports to dicts, loading users and comments with one IN query each."""
+    names = _user_names(db, [r.reporter_id for r in reports] + [r.resolved_by for r in reports])
+    comment_ids = {r.comment_id for r in reports}
+    comments = {
+        row.id: row for row in db.query(Comment.id, Comment.content, Comment.author_id).filter(
+            Comment.id.in_(comment_ids)
+        )
+    } if comment_ids else {}
+
+    reads = []
+    for report in reports:
+        comment = comments.get(report.comment_id)
+        reads.append({
+            "id": report.id,
+            "comment_id": report.comment_id,
+            "reporter_id": report.reporter_id,
+            "reporter_name": names.get(report.reporter_id),
+            "reason": report.reason,
+            "description": report.description,
+            "status": report.status.value,
+            "resolved_by": report.resolved_by,
+            "resolver_name": names.get(report.resolved_by) if report.resolved_by else None,
+            "resolved_at": report.resolved_at,
+            "resolution_notes": report.resolution_notes,
+            "created_at": report.created_at,
+            "comment_content": comment.content if comment else None,
+            "comment_author_id": comment.author_id if comment else None,
+        })
+    return reads
+
+
 def to_comment_report_read(db: Session, report: CommentReport) -> dict:
     """Convert CommentReport to dict."""
-    reporter = db.get(User, report.reporter_id)
-    reporter_name = reporter.name if reporter else None
-    
-    resolver_name = None
-    if report.resolved_by:
-        resolver = db.get(User, report.resolved_by)
-        resolver_name = resolver.name if resolver else None
-    
-    comment = db.get(Comment, report.comment_id)
-    comment_content = comment.content if comment else None
-    comment_author_id = comment.author_id if comment else None
-    
-    return {
-        "id": report.id,
-        "comment_id": report.comment_id,
-        "reporter_id": report.reporter_id,
-        "reporter_name": reporter_name,
-        "reason": report.reason,
-        "description": report.description,
-        "status": report.status.value,
-        "resolved_by": report.resolved_by,
-        "resolver_name": resolver_name,
-        "resolved_at": report.resolved_at,
-        "resolution_notes": report.resolution_notes,
-        "created_at": report.created_at,
-        "comment_content": comment_content,
-        "comment_author_id": comment_author_id,
-    }
+    return to_comment_report_reads(db, [report])[0]
 
 def delete_comment(db: Session, comment_id: int):
     """Delete a comment (admin action)."""
     comment = db.get(Comment, comment_id)
     if comment:
         db.delete(comment)
+        index_shoutouts(db, [comment.shoutout_id])
         db.commit()
+        response_cache.bump()
     return True
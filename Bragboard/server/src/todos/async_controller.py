@@ -0,0 +1,76 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.todos import async_service
+from src.todos.models import ShoutoutPage, ShoutoutSummaryPage, ReactorPage, ReactionToggleRead
+from src.database.async_core import get_async_db
+from src.database.replica import get_async_read_db, read_cache_key
+from src.cache import response_cache
+from src.rate_limiter import rate_limit
+from src.todos.controller import TagQuery, MatchQuery
+
+# Mounted ahead of controller.router when ASYNC_DB is enabled; same paths and responses.
+router = APIRouter(prefix="/shoutouts", tags=["Shoutouts"])
+
+@router.get("/feed", response_model=ShoutoutPage)
+async def api_feed(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    tag: Optional[List[str]] = TagQuery,
+    match: Literal["any", "all"] = MatchQuery,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    async def load():
+        return ShoutoutPage.model_validate(await async_service.list_shoutouts_page(db, limit, cursor, tag, match))
+
+    try:
+        return await response_cache.aget_or_set(read_cache_key(db, "shoutouts_feed", limit, cursor, tuple(tag or ()), match), load)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/feed/summary", response_model=ShoutoutSummaryPage)
+async def api_feed_summary(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    viewer_id: Optional[int] = Query(None, description="User whose own reactions are flagged"),
+    tag: Optional[List[str]] = TagQuery,
+    match: Literal["any", "all"] = MatchQuery,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    async def load():
+        return ShoutoutSummaryPage.model_validate(
+            await async_service.list_shoutouts_summary_page(db, limit, cursor, viewer_id, tag, match)
+        )
+
+    try:
+        return await response_cache.aget_or_set(read_cache_key(db, "shoutouts_feed_summary", limit, cursor, viewer_id, tuple(tag or ()), match), load)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _toggle(db: AsyncSession, shoutout_id: int, user_id: int, kind: str):
+    result = await async_service.toggle_reaction(db, shoutout_id, user_id, kind)
+    if not result:
+        raise HTTPException(status_code=404, detail="Shoutout or User not found")
+    return result
+
+@router.post("/{shoutout_id}/like", response_model=ReactionToggleRead, dependencies=[Depends(rate_limit("reactions"))])
+async def api_like(shoutout_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _toggle(db, shoutout_id, user_id, "likes")
+
+@router.post("/{shoutout_id}/clap", response_model=ReactionToggleRead, dependencies=[Depends(rate_limit("reactions"))])
+async def api_clap(shoutout_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _toggle(db, shoutout_id, user_id, "claps")
+
+@router.post("/{shoutout_id}/star", response_model=ReactionToggleRead, dependencies=[Depends(rate_limit("reactions"))])
+async def api_star(shoutout_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _toggle(db, shoutout_id, user_id, "stars")
+
+@router.get("/{shoutout_id}/reactions/{kind}", response_model=ReactorPage)
+async def api_reactors(
+    shoutout_id: int,
+    kind: Literal["likes", "claps", "stars"],
+    limit: int = Query(50, ge=1, le=200),
+    after: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await async_service.list_reactors(db, shoutout_id, kind, limit, after)
@@ -0,0 +1,83 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.entities.todo import Shoutout
+from src.entities.user import User
+from src.cache import response_cache
+from src.database.core import insert_ignoring_conflicts
+from src.notifications.dispatcher import dispatcher
+from src.notifications.service import outbox_insert_statement
+from .service import (
+    REACTION_SAMPLE_SIZE, REACTION_TABLES, _keyset_statement, _split_page, feed_statement, summary_feed_statement,
+    reaction_summary_statements, empty_reaction_summaries, fill_reaction_summaries, summary_items,
+    reactors_statement, reaction_notification, tag_filter, _with_filter,
+    reaction_count_statements, reaction_count_statement,
+)
+
+# Async counterparts of the hot feed and reaction services in service.py.
+# They issue the same statements; only the session differs.
+
+async def _keyset_page(db: AsyncSession, stmt, limit: int, cursor: str = None):
+    rows = (await db.execute(_keyset_statement(stmt, limit, cursor))).scalars().all()
+    return _split_page(rows, limit)
+
+async def list_shoutouts_page(db: AsyncSession, limit: int = 20, cursor: str = None, tags=None, match: str = "any"):
+    stmt = _with_filter(feed_statement(), await db.run_sync(tag_filter, tags, match))
+    items, next_cursor = await _keyset_page(db, stmt, limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
+async def get_reaction_summaries(db: AsyncSession, shoutout_ids, viewer_id: int = None, sample_size: int = REACTION_SAMPLE_SIZE):
+    summaries = empty_reaction_summaries(shoutout_ids)
+    if not summaries:
+        return summaries
+    counts, mine, samples = reaction_summary_statements(shoutout_ids, viewer_id, sample_size)
+    return fill_reaction_summaries(
+        summaries,
+        (await db.execute(counts)).all(),
+        (await db.execute(mine)).all() if mine is not None else [],
+        (await db.execute(samples)).all(),
+    )
+
+async def list_shoutouts_summary_page(db: AsyncSession, limit: int = 20, cursor: str = None, viewer_id: int = None,
+                                      tags=None, match: str = "any"):
+    stmt = _with_filter(summary_feed_statement(), await db.run_sync(tag_filter, tags, match))
+    shouts, next_cursor = await _keyset_page(db, stmt, limit, cursor)
+    summaries = await get_reaction_summaries(db, [s.id for s in shouts], viewer_id)
+    return {"items": summary_items(shouts, summaries), "next_cursor": next_cursor}
+
+async def list_reactors(db: AsyncSession, shoutout_id: int, kind: str, limit: int = 50, after: int = None):
+    rows = (await db.execute(reactors_statement(shoutout_id, kind, limit, after))).scalars().all()
+    items = rows[:limit]
+    next_cursor = items[-1].id if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+async def toggle_reaction(db: AsyncSession, shoutout_id: int, user_id: int, kind: str):
+    """Async service._toggle_reaction: DELETE, else conflict-tolerant INSERT, one commit."""
+    sender_id = (await db.execute(select(Shoutout.sender_id).where(Shoutout.id == shoutout_id))).scalar()
+    if sender_id is None:
+        return None
+    user_name = (await db.execute(select(User.name).where(User.id == user_id))).scalar()
+    if user_name is None:
+        return None
+
+    table = REACTION_TABLES[kind]
+    removed = (await db.execute(
+        table.delete().where(table.c.shoutout_id == shoutout_id, table.c.user_id == user_id)
+    )).rowcount
+    reacted = not removed
+    if reacted:
+        inserted = (await db.execute(
+            insert_ignoring_conflicts(db.sync_session, table).values(shoutout_id=shoutout_id, user_id=user_id)
+        )).rowcount
+        # Notify author if not self-reaction
+        if inserted and sender_id != user_id:
+            await db.execute(outbox_insert_statement([reaction_notification(kind, sender_id, user_name)]))
+    else:
+        inserted = 0
+
+    for stmt in reaction_count_statements(db.sync_session, {(shoutout_id, kind): inserted - removed}):
+        await db.execute(stmt)
+    count = (await db.execute(reaction_count_statement(shoutout_id, kind))).scalar() or 0
+    await db.commit()
+    dispatcher.wake()
+    response_cache.bump()
+    return {"shoutout_id": shoutout_id, "reacted": reacted, "count": count}
@@ -1,18 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from src.todos.service import create_shoutout, list_shoutouts, get_shoutout, update_shoutout, delete_shoutout, toggle_like, toggle_clap, toggle_star, add_comment, get_recent_reactions
-from src.todos.models import ShoutoutCreate, ShoutoutRead, CommentCreate, CommentRead
+from src.todos.service import create_shoutout, list_shoutouts, get_popular_tags, get_comment_thread, list_shoutouts_page, list_shoutouts_summary_page, list_reactors, get_shoutout, update_shoutout, delete_shoutout, toggle_like, toggle_clap, toggle_star, add_comment, get_recent_reactions
+from src.todos.models import PopularTag, CommentThreadPage, ShoutoutCreate, ShoutoutRead, ShoutoutPage, ShoutoutSummaryPage, ReactorPage, ReactionToggleRead, CommentCreate, CommentRead
 from src.database.core import get_db
+from src.database.replica import get_read_db, read_cache_key
+from src.cache import response_cache
+from src.rate_limiter import rate_limit
 
 router = APIRouter(prefix="/shoutouts", tags=["Shoutouts"])
+tags_router = APIRouter(prefix="/tags", tags=["Tags"])
+
+TagQuery = Query(None, description="Tag name; repeat to filter by several")
+MatchQuery = Query("any", description="Whether shoutouts need any or all of the given tags")
 
 @router.post("", response_model=ShoutoutRead, status_code=status.HTTP_201_CREATED)
 def api_create(payload: ShoutoutCreate, db: Session = Depends(get_db)):
     return create_shoutout(db, payload)
 
 @router.get("", response_model=list[ShoutoutRead])
-def api_list(db: Session = Depends(get_db)):
-    return list_shoutouts(db)
+def api_list(
+    tag: Optional[List[str]] = TagQuery,
+    match: Literal["any", "all"] = MatchQuery,
+    db: Session = Depends(get_read_db)
+):
+    return response_cache.get_or_set(
+        read_cache_key(db, "shoutouts", tuple(tag or ()), match),
+        lambda: [ShoutoutRead.model_validate(s) for s in list_shoutouts(db, tag, match)]
+    )
+
+@router.get("/feed", response_model=ShoutoutPage)
+def api_feed(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    tag: Optional[List[str]] = TagQuery,
+    match: Literal["any", "all"] = MatchQuery,
+    db: Session = Depends(get_read_db)
+):
+    try:
+        return response_cache.get_or_set(
+            read_cache_key(db, "shoutouts_feed", limit, cursor, tuple(tag or ()), match),
+            lambda: ShoutoutPage.model_validate(list_shoutouts_page(db, limit, cursor, tag, match))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/feed/summary", response_model=ShoutoutSummaryPage)
+def api_feed_summary(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    viewer_id: Optional[int] = Query(None, description="User whose own reactions are flagged"),
+    tag: Optional[List[str]] = TagQuery,
+    match: Literal["any", "all"] = MatchQuery,
+    db: Session = Depends(get_read_db)
+):
+    try:
+        return response_cache.get_or_set(
+            read_cache_key(db, "shoutouts_feed_summary", limit, cursor, viewer_id, tuple(tag or ()), match),
+            lambda: ShoutoutSummaryPage.model_validate(list_shoutouts_summary_page(db, limit, cursor, viewer_id, tag, match))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{shoutout_id}", response_model=ShoutoutRead)
 def api_get(shoutout_id: int, db: Session = Depends(get_db)):
@@ -30,35 +78,88 @@ def api_delete(shoutout_id: int, db: Session = Depends(get_db)):
     delete_shoutout(db, shoutout_id)
     return None
 
-@router.post("/{shoutout_id}/like", response_model=ShoutoutRead)
+@router.post("/{shoutout_id}/like", response_model=ReactionToggleRead, dependencies=[Depends(rate_limit("reactions"))])
 def api_like(shoutout_id: int, user_id: int, db: Session = Depends(get_db)):
-    shout = toggle_like(db, shoutout_id, user_id)
-    if not shout:
+    result = toggle_like(db, shoutout_id, user_id)
+    if not result:
         raise HTTPException(status_code=404, detail="Shoutout or User not found")
-    return shout
+    return result
 
-@router.post("/{shoutout_id}/clap", response_model=ShoutoutRead)
+@router.post("/{shoutout_id}/clap", response_model=ReactionToggleRead, dependencies=[Depends(rate_limit("reactions"))])
 def api_clap(shoutout_id: int, user_id: int, db: Session = Depends(get_db)):
-    shout = toggle_clap(db, shoutout_id, user_id)
-    if not shout:
+    result = toggle_clap(db, shoutout_id, user_id)
+    if not result:
         raise HTTPException(status_code=404, detail="Shoutout or User not found")
-    return shout
+    return result
 
-@router.post("/{shoutout_id}/star", response_model=ShoutoutRead)
+@router.post("/{shoutout_id}/star", response_model=ReactionToggleRead, dependencies=[Depends(rate_limit("reactions"))])
 def api_star(shoutout_id: int, user_id: int, db: Session = Depends(get_db)):
-    shout = toggle_star(db, shoutout_id, user_id)
-    if not shout:
+    result = toggle_star(db, shoutout_id, user_id)
+    if not result:
         raise HTTPException(status_code=404, detail="Shoutout or User not found")
-    return shout
+    return result
 
 
-@router.post("/{shoutout_id}/comments", response_model=CommentRead)
+@router.get("/{shoutout_id}/reactions/{kind}", response_model=ReactorPage)
+def api_reactors(
+    shoutout_id: int,
+    kind: Literal["likes", "claps", "stars"],
+    limit: int = Query(50, ge=1, le=200),
+    after: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db)
+):
+    return list_reactors(db, shoutout_id, kind, limit, after)
+
+@router.post("/{shoutout_id}/comments", response_model=CommentRead, dependencies=[Depends(rate_limit("comments"))])
 def api_comment(shoutout_id: int, payload: CommentCreate, user_id: int, db: Session = Depends(get_db)):
     comment = add_comment(db, shoutout_id, user_id, payload.content, payload.parent_id)
     if not comment:
         raise HTTPException(status_code=404, detail="Shoutout not found")
     return comment
 
+@router.get("/{shoutout_id}/comments", response_model=CommentThreadPage)
+def api_comment_threads(
+    shoutout_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    replies_limit: int = Query(5, ge=0, le=50, description="Replies shown under each comment"),
+    db: Session = Depends(get_read_db)
+):
+    """Top-level comments, oldest first, with their reply trees loaded in a single query."""
+    try:
+        return response_cache.get_or_set(
+            read_cache_key(db, "comment_threads", shoutout_id, limit, cursor, replies_limit),
+            lambda: CommentThreadPage.model_validate(get_comment_thread(db, shoutout_id, None, limit, cursor, replies_limit))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{shoutout_id}/comments/{comment_id}/replies", response_model=CommentThreadPage)
+def api_comment_replies(
+    shoutout_id: int,
+    comment_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="replies_cursor of the comment, or next_cursor of the previous page"),
+    replies_limit: int = Query(5, ge=0, le=50, description="Replies shown under each reply"),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        return response_cache.get_or_set(
+            read_cache_key(db, "comment_replies", shoutout_id, comment_id, limit, cursor, replies_limit),
+            lambda: CommentThreadPage.model_validate(get_comment_thread(db, shoutout_id, comment_id, limit, cursor, replies_limit))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/reactions/recent", response_model=list[CommentRead])
 def api_recent_reactions(db: Session = Depends(get_db)):
     return get_recent_reactions(db)
+
+
+@tags_router.get("/popular", response_model=list[PopularTag])
+def api_popular_tags(
+    window: Literal["7d", "30d", "90d", "all"] = Query("30d", description="Rolling window the uses are counted over"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    return response_cache.get_or_set(read_cache_key(db, "popular_tags", window, limit), lambda: get_popular_tags(db, window, limit))
@@ -15,6 +15,11 @@ class TagRead(BaseModel):
     id: int
     name: str
 
+class PopularTag(BaseModel):
+    id: int
+    name: str
+    uses: int
+
 class CommentCreate(BaseModel):
     content: str
     parent_id: Optional[int] = None
@@ -27,6 +32,22 @@ class CommentRead(BaseModel):
     author: UserRead
     created_at: datetime
 
+class CommentNode(BaseModel):
+    id: int
+    content: str
+    parent_id: Optional[int] = None
+    author: UserRead
+    created_at: datetime
+    reply_count: int = 0
+    replies: List["CommentNode"] = []
+    # Set when reply_count exceeds the replies shown; without it (and
+    # reply_count > 0) fetch the replies from the start
+    replies_cursor: Optional[str] = None
+
+class CommentThreadPage(BaseModel):
+    items: List[CommentNode] = []
+    next_cursor: Optional[str] = None
+
 class ShoutoutRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
@@ -41,3 +62,40 @@ class ShoutoutRead(BaseModel):
     claps: List[UserRead] = []
     stars: List[UserRead] = []
     created_at: datetime
+
+class ShoutoutPage(BaseModel):
+    items: List[ShoutoutRead] = []
+    next_cursor: Optional[str] = None
+
+class ReactionSummary(BaseModel):
+    count: int = 0
+    sample: List[str] = []
+    reacted: bool = False
+
+class ShoutoutSummaryRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    message: str
+    sender: UserRead
+    recipients: List[UserRead] = []
+    tags: List[TagRead] = []
+    comments: List[CommentRead] = []
+    likes: ReactionSummary = ReactionSummary()
+    claps: ReactionSummary = ReactionSummary()
+    stars: ReactionSummary = ReactionSummary()
+    created_at: datetime
+
+class ShoutoutSummaryPage(BaseModel):
+    items: List[ShoutoutSummaryRead] = []
+    next_cursor: Optional[str] = None
+
+class ReactorPage(BaseModel):
+    items: List[UserRead] = []
+    next_cursor: Optional[int] = None
+
+class ReactionToggleRead(BaseModel):
+    shoutout_id: int
+    reacted: bool
+    count: int
@@ -1,9 +1,36 @@
-from sqlalchemy.orm import Session, joinedload
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, func, select, literal, union_all, false
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from .models import ShoutoutCreate
-from src.entities.todo import Shoutout, Tag, Comment
+from src.entities.todo import Shoutout, Tag, TagUsageDaily, ShoutoutReactionCount, Comment, shoutout_recipient_table, shoutout_tag_table, shoutout_likes_table, shoutout_claps_table, shoutout_stars_table
 from src.entities.user import User
-from src.notifications.service import create_notification
+from src.notifications.service import enqueue_notifications
+from src.notifications.dispatcher import dispatcher
 from src.notifications.models import NotificationCreate
+from src.cache import response_cache, tag_id_cache
+from src.database.core import insert_ignoring_conflicts
+from src.pagination import encode_cursor, decode_cursor
+from src.users.service import adjust_recognition_counts
+from src.search.service import index_shoutouts
+
+REACTION_TABLES = {
+    "likes": shoutout_likes_table,
+    "claps": shoutout_claps_table,
+    "stars": shoutout_stars_table,
+}
+# Notification type and verb for each reaction kind
+REACTION_NOTIFICATIONS = {
+    "likes": ("like", "liked"),
+    "claps": ("clap", "clapped for"),
+    "stars": ("star", "starred"),
+}
+REACTION_SAMPLE_SIZE = 3
+# Comment threads: replies shown per comment, and how deep one request descends
+COMMENT_REPLIES_PER_NODE = 5
+COMMENT_THREAD_MAX_DEPTH = 5
+# Rolling windows for popular tags, in days (None = all time)
+TAG_POPULARITY_WINDOWS = {"7d": 7, "30d": 30, "90d": 90, "all": None}
 
 def create_shoutout(db: Session, payload: ShoutoutCreate):
     shout = Shoutout(
@@ -16,47 +43,442 @@ def create_shoutout(db: Session, payload: ShoutoutCreate):
     sender_name = sender.name if sender else "Someone"
 
 
+    notifs = []
     if payload.recipient_ids:
         # Fetch all recipients
         recipients = db.query(User).filter(User.id.in_(payload.recipient_ids)).all()
         shout.recipients.extend(recipients)
+        adjust_recognition_counts(db, {r.id: 1 for r in recipients})
         
         # Trigger Notification for each tagged user
-        for recipient in recipients:
-             if recipient.id != payload.sender_id:
-                notif = NotificationCreate(
-                    recipient_id=recipient.id,
-                    type="shoutout_tag",
-                    message=f"{sender_name} tagged you in a shoutout",
-                    link=f"/dashboard" 
-                )
-                create_notification(db, notif)
-
-    tags = [get_or_create_tag(db, t) for t in (payload.tags or []) if t and t.strip()]
-    shout.tags = tags
+        notifs = [
+            NotificationCreate(
+                recipient_id=recipient.id,
+                type="shoutout_tag",
+                message=f"{sender_name} tagged you in a shoutout",
+                link=f"/dashboard"
+            )
+            for recipient in recipients
+            if recipient.id != payload.sender_id
+        ]
+
+    tag_ids = resolve_tag_ids(db, payload.tags or [])
     db.add(shout)
+    db.flush()
+    if tag_ids:
+        db.execute(shoutout_tag_table.insert().values([
+            {"shoutout_id": shout.id, "tag_id": tag_id} for tag_id in tag_ids
+        ]))
+    adjust_tag_usage(db, {(tag_id, shout.created_at.date()): 1 for tag_id in tag_ids})
+    index_shoutouts(db, [shout.id])
+    # Notification intents commit atomically with the shoutout
+    enqueue_notifications(db, notifs)
     db.commit()
+    dispatcher.wake()
+    response_cache.bump()
     db.refresh(shout)
     return shout
 
-def get_or_create_tag(db: Session, tag_name: str):
-    tag_name = tag_name.strip().lower()
-    tag = db.query(Tag).filter(Tag.name == tag_name).first()
-    if not tag:
-        tag = Tag(name=tag_name)
-        db.add(tag)
-        db.commit()
-        db.refresh(tag)
-    return tag
+def normalize_tag_names(names):
+    """Strips and lowercases tag names, dropping blanks and duplicates while keeping order."""
+    seen = {}
+    for name in names:
+        if name and name.strip():
+            seen.setdefault(name.strip().lower(), None)
+    return list(seen)
+
+def resolve_tag_ids(db: Session, names):
+    """
+    Maps tag names to ids, creating missing tags, without committing.
+    Hot names come from an in-process cache; the rest cost one IN query,
+    plus one conflict-tolerant multi-row INSERT and a re-select when new
+    tags are needed, so concurrent creators of the same tag don't fail.
+    """
+    names = normalize_tag_names(names)
+    if not names:
+        return []
+
+    ids = tag_id_cache.get_many(names)
+    missing = [n for n in names if n not in ids]
+    if missing:
+        existing = dict(db.query(Tag.name, Tag.id).filter(Tag.name.in_(missing)).all())
+        # Only committed rows are cached, so a rollback can't leave dangling ids
+        tag_id_cache.set_many(existing)
+        ids.update(existing)
+
+        to_create = [n for n in missing if n not in ids]
+        if to_create:
+            now = datetime.utcnow()
+            db.execute(insert_ignoring_conflicts(db, Tag.__table__).values([
+                {"name": n, "created_at": now} for n in to_create
+            ]))
+            ids.update(db.query(Tag.name, Tag.id).filter(Tag.name.in_(to_create)).all())
+
+    return [ids[n] for n in names]
+
+def tag_filter(db: Session, names, match: str = "any"):
+    """
+    WHERE clause limiting Shoutout to those carrying any (or all) of the
+    named tags, answered from the (tag_id, shoutout_id) index. Returns None
+    when no tag names are given. Unknown names never match.
+    """
+    names = normalize_tag_names(names or [])
+    if not names:
+        return None
+    ids = tag_id_cache.get_many(names)
+    missing = [n for n in names if n not in ids]
+    if missing:
+        existing = dict(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+        tag_id_cache.set_many(existing)
+        ids.update(existing)
+
+    tag_ids = [ids[n] for n in names if n in ids]
+    if not tag_ids or (match == "all" and len(tag_ids) < len(names)):
+        return false()
+    tagged = select(shoutout_tag_table.c.shoutout_id).where(shoutout_tag_table.c.tag_id.in_(tag_ids))
+    if match == "all" and len(tag_ids) > 1:
+        tagged = tagged.group_by(shoutout_tag_table.c.shoutout_id).having(func.count() == len(tag_ids))
+    return Shoutout.id.in_(tagged)
+
+def adjust_tag_usage(db: Session, deltas: dict):
+    """
+    Applies {(tag_id, day): delta} to the daily tag usage counters without
+    committing: missing rows are inserted at zero (conflict-tolerant), then
+    one UPDATE is issued per distinct (day, delta).
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = TagUsageDaily.__table__
+    db.execute(insert_ignoring_conflicts(db, table).values([
+        {"tag_id": tag_id, "day": day, "uses": 0} for tag_id, day in deltas
+    ]))
+    grouped = {}
+    for (tag_id, day), delta in deltas.items():
+        grouped.setdefault((day, delta), []).append(tag_id)
+    for (day, delta), tag_ids in grouped.items():
+        db.execute(table.update().where(table.c.day == day, table.c.tag_id.in_(tag_ids)).values(uses=table.c.uses + delta))
+
+def reaction_count_statements(db: Session, deltas: dict):
+    """
+    Statements applying {(shoutout_id, kind): delta} to the reaction
+    counters: a conflict-tolerant INSERT of missing rows at zero, then one
+    UPDATE per distinct (kind, delta). `db` only selects the dialect.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return []
+    table = ShoutoutReactionCount.__table__
+    statements = [insert_ignoring_conflicts(db, table).values([
+        {"shoutout_id": shoutout_id, "kind": kind, "reaction_count": 0} for shoutout_id, kind in deltas
+    ])]
+    grouped = {}
+    for (shoutout_id, kind), delta in deltas.items():
+        grouped.setdefault((kind, delta), []).append(shoutout_id)
+    for (kind, delta), shoutout_ids in grouped.items():
+        statements.append(table.update().where(table.c.kind == kind, table.c.shoutout_id.in_(shoutout_ids)).values(
+            reaction_count=table.c.reaction_count + delta
+        ))
+    return statements
+
+def adjust_reaction_counts(db: Session, deltas: dict):
+    """Applies {(shoutout_id, kind): delta} to the reaction counters without committing."""
+    for stmt in reaction_count_statements(db, deltas):
+        db.execute(stmt)
+
+def reaction_count_statement(shoutout_id: int, kind: str):
+    return select(ShoutoutReactionCount.reaction_count).where(
+        ShoutoutReactionCount.shoutout_id == shoutout_id, ShoutoutReactionCount.kind == kind
+    )
+
+def get_reaction_deltas_for_user(db: Session, user_id: int) -> dict:
+    """
+    The {(shoutout_id, kind): -1} that removing a user's reactions applies,
+    for use before deleting that user. Shoutouts they sent are left out;
+    their counters go with them.
+    """
+    deltas = {}
+    for kind, table in REACTION_TABLES.items():
+        rows = db.execute(
+            select(table.c.shoutout_id)
+            .join(Shoutout, Shoutout.id == table.c.shoutout_id)
+            .where(table.c.user_id == user_id, Shoutout.sender_id != user_id)
+        )
+        deltas.update({(shoutout_id, kind): -1 for (shoutout_id,) in rows})
+    return deltas
+
+def rebuild_reaction_counts(db: Session) -> int:
+    """Recomputes every reaction counter from the reaction tables. Returns the number of rows written."""
+    db.query(ShoutoutReactionCount).delete()
+    rows = [
+        {"shoutout_id": shoutout_id, "kind": kind, "reaction_count": count}
+        for kind, table in REACTION_TABLES.items()
+        for shoutout_id, count in db.execute(
+            select(table.c.shoutout_id, func.count()).group_by(table.c.shoutout_id)
+        )
+    ]
+    if rows:
+        db.execute(ShoutoutReactionCount.__table__.insert().values(rows))
+    db.commit()
+    return len(rows)
+
+def ensure_reaction_counts(db: Session):
+    """Backfills the counters once when the table is new but reactions exist."""
+    if db.query(ShoutoutReactionCount.shoutout_id).first() is None and \
+            any(db.query(table.c.shoutout_id).first() is not None for table in REACTION_TABLES.values()):
+        rebuild_reaction_counts(db)
+
+def get_tag_usage_deltas(db: Session, shoutout_ids) -> dict:
+    """The {(tag_id, day): -count} that removing these shoutouts applies to tag usage."""
+    rows = db.execute(
+        select(shoutout_tag_table.c.tag_id, Shoutout.created_at)
+        .join(Shoutout, Shoutout.id == shoutout_tag_table.c.shoutout_id)
+        .where(Shoutout.id.in_(shoutout_ids))
+    )
+    return {key: -count for key, count in Counter((tag_id, created_at.date()) for tag_id, created_at in rows).items()}
+
+def rebuild_tag_usage(db: Session) -> int:
+    """Recomputes the daily tag usage counters from shoutout_tags. Returns the number of rows written."""
+    usage = Counter(
+        (tag_id, created_at.date())
+        for tag_id, created_at in db.execute(
+            select(shoutout_tag_table.c.tag_id, Shoutout.created_at)
+            .join(Shoutout, Shoutout.id == shoutout_tag_table.c.shoutout_id)
+        )
+    )
+    db.query(TagUsageDaily).delete()
+    if usage:
+        db.execute(TagUsageDaily.__table__.insert().values([
+            {"tag_id": tag_id, "day": day, "uses": uses} for (tag_id, day), uses in usage.items()
+        ]))
+    db.commit()
+    return len(usage)
+
+def ensure_tag_usage(db: Session):
+    """Backfills the counters once when the table is new but tagged shoutouts exist."""
+    if db.query(TagUsageDaily.tag_id).first() is None and \
+            db.query(shoutout_tag_table.c.tag_id).first() is not None:
+        rebuild_tag_usage(db)
 
-def list_shoutouts(db: Session):
-    return db.query(Shoutout).options(
+def get_popular_tags(db: Session, window: str = "30d", limit: int = 10):
+    """Tags ordered by uses within the rolling window, summed from the daily counters."""
+    days = TAG_POPULARITY_WINDOWS[window]
+    uses = func.sum(TagUsageDaily.uses).label("uses")
+    stmt = select(Tag.id, Tag.name, uses).join(TagUsageDaily, TagUsageDaily.tag_id == Tag.id)
+    if days is not None:
+        stmt = stmt.where(TagUsageDaily.day >= datetime.utcnow().date() - timedelta(days=days - 1))
+    stmt = stmt.group_by(Tag.id, Tag.name).having(uses > 0).order_by(uses.desc(), Tag.name).limit(limit)
+    return [{"id": tag_id, "name": name, "uses": count} for tag_id, name, count in db.execute(stmt)]
+
+def list_shoutouts(db: Session, tags=None, match: str = "any"):
+    query = db.query(Shoutout).options(
         joinedload(Shoutout.sender),
         joinedload(Shoutout.likes),
         joinedload(Shoutout.claps),
         joinedload(Shoutout.stars),
         joinedload(Shoutout.comments).joinedload(Comment.author)
-    ).order_by(Shoutout.created_at.desc()).all()
+    )
+    clause = tag_filter(db, tags, match)
+    if clause is not None:
+        query = query.filter(clause)
+    return query.order_by(Shoutout.created_at.desc()).all()
+
+def _keyset_statement(stmt, limit: int, cursor: str = None):
+    """Applies the (created_at, id) cursor, newest-first order and limit + 1 to a Shoutout select."""
+    if cursor:
+        created_at, shoutout_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Shoutout.created_at < created_at,
+            and_(Shoutout.created_at == created_at, Shoutout.id < shoutout_id)
+        ))
+    return stmt.order_by(Shoutout.created_at.desc(), Shoutout.id.desc()).limit(limit + 1)
+
+def _split_page(rows, limit: int):
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
+
+def _keyset_page(db: Session, stmt, limit: int, cursor: str = None):
+    rows = db.execute(_keyset_statement(stmt, limit, cursor)).scalars().all()
+    return _split_page(rows, limit)
+
+def feed_statement():
+    """
+    Feed page select. Collections are loaded with one SELECT ... IN per
+    relationship, so the query count per page is fixed regardless of page
+    size or table size.
+    """
+    return select(Shoutout).options(
+        joinedload(Shoutout.sender),
+        selectinload(Shoutout.recipients),
+        selectinload(Shoutout.tags),
+        selectinload(Shoutout.likes),
+        selectinload(Shoutout.claps),
+        selectinload(Shoutout.stars),
+        selectinload(Shoutout.comments).joinedload(Comment.author)
+    )
+
+def summary_feed_statement():
+    """Like feed_statement, but never loads the reactor collections."""
+    return select(Shoutout).options(
+        joinedload(Shoutout.sender),
+        selectinload(Shoutout.recipients),
+        selectinload(Shoutout.tags),
+        selectinload(Shoutout.comments).joinedload(Comment.author)
+    )
+
+def _with_filter(stmt, clause):
+    return stmt if clause is None else stmt.where(clause)
+
+def list_shoutouts_page(db: Session, limit: int = 20, cursor: str = None, tags=None, match: str = "any"):
+    """Returns one page of the feed, newest first, keyed on (created_at, id), optionally filtered by tags."""
+    stmt = _with_filter(feed_statement(), tag_filter(db, tags, match))
+    items, next_cursor = _keyset_page(db, stmt, limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
+def reaction_summary_statements(shoutout_ids, viewer_id: int = None, sample_size: int = REACTION_SAMPLE_SIZE):
+    """
+    The three aggregate selects behind get_reaction_summaries: counts per
+    kind, the viewer's own reactions (None without a viewer), and the first
+    `sample_size` reactor names per kind.
+    """
+    reactions = union_all(*[
+        select(
+            table.c.shoutout_id.label("shoutout_id"),
+            table.c.user_id.label("user_id"),
+            literal(kind).label("kind"),
+        ).where(table.c.shoutout_id.in_(shoutout_ids))
+        for kind, table in REACTION_TABLES.items()
+    ]).subquery()
+
+    counts = select(
+        reactions.c.shoutout_id, reactions.c.kind, func.count().label("count")
+    ).group_by(reactions.c.shoutout_id, reactions.c.kind)
+
+    mine = None
+    if viewer_id is not None:
+        mine = select(reactions.c.shoutout_id, reactions.c.kind).where(reactions.c.user_id == viewer_id)
+
+    ranked = select(
+        reactions.c.shoutout_id,
+        reactions.c.kind,
+        User.name,
+        func.row_number().over(
+            partition_by=(reactions.c.shoutout_id, reactions.c.kind),
+            order_by=reactions.c.user_id,
+        ).label("rank"),
+    ).join(User, User.id == reactions.c.user_id).subquery()
+    samples = select(ranked.c.shoutout_id, ranked.c.kind, ranked.c.name).where(
+        ranked.c.rank <= sample_size
+    ).order_by(ranked.c.shoutout_id, ranked.c.kind, ranked.c.rank)
+
+    return counts, mine, samples
+
+def empty_reaction_summaries(shoutout_ids) -> dict:
+    return {
+        sid: {kind: {"count": 0, "sample": [], "reacted": False} for kind in REACTION_TABLES}
+        for sid in shoutout_ids
+    }
+
+def fill_reaction_summaries(summaries: dict, counts, mine, samples) -> dict:
+    for shoutout_id, kind, count in counts:
+        summaries[shoutout_id][kind]["count"] = count
+    for shoutout_id, kind in mine:
+        summaries[shoutout_id][kind]["reacted"] = True
+    for shoutout_id, kind, name in samples:
+        summaries[shoutout_id][kind]["sample"].append(name)
+    return summaries
+
+def get_reaction_summaries(db: Session, shoutout_ids, viewer_id: int = None, sample_size: int = REACTION_SAMPLE_SIZE):
+    """
+    Returns {shoutout_id: {"likes": {...}, "claps": {...}, "stars": {...}}} with
+    a count, a few reactor names and whether viewer_id reacted, for each id.
+    Uses three aggregate queries in total instead of loading reactor lists.
+    """
+    summaries = empty_reaction_summaries(shoutout_ids)
+    if not summaries:
+        return summaries
+    counts, mine, samples = reaction_summary_statements(shoutout_ids, viewer_id, sample_size)
+    return fill_reaction_summaries(
+        summaries,
+        db.execute(counts).all(),
+        db.execute(mine).all() if mine is not None else [],
+        db.execute(samples).all(),
+    )
+
+def summary_items(shouts, summaries: dict):
+    return [
+        {
+            "id": s.id,
+            "title": s.title,
+            "message": s.message,
+            "sender": s.sender,
+            "recipients": s.recipients,
+            "tags": s.tags,
+            "comments": s.comments,
+            "created_at": s.created_at,
+            **summaries[s.id],
+        }
+        for s in shouts
+    ]
+
+def list_shoutouts_summary_page(db: Session, limit: int = 20, cursor: str = None, viewer_id: int = None,
+                                tags=None, match: str = "any"):
+    """
+    Same paging as list_shoutouts_page, but reactions are returned as
+    aggregated summaries and the reactor collections are never loaded.
+    """
+    stmt = _with_filter(summary_feed_statement(), tag_filter(db, tags, match))
+    shouts, next_cursor = _keyset_page(db, stmt, limit, cursor)
+    return _summary_page(db, shouts, next_cursor, viewer_id)
+
+def reactors_statement(shoutout_id: int, kind: str, limit: int, after: int = None):
+    table = REACTION_TABLES[kind]
+    stmt = select(User).join(table, table.c.user_id == User.id).where(table.c.shoutout_id == shoutout_id)
+    if after is not None:
+        stmt = stmt.where(User.id > after)
+    return stmt.order_by(User.id).limit(limit + 1)
+
+def _summary_page(db: Session, shouts, next_cursor, viewer_id: int = None):
+    summaries = get_reaction_summaries(db, [s.id for s in shouts], viewer_id)
+    return {"items": summary_items(shouts, summaries), "next_cursor": next_cursor}
+
+def list_sent_shoutouts_page(db: Session, user_id: int, limit: int = 20, cursor: str = None, viewer_id: int = None):
+    """A user's sent shoutouts, newest first, read from the (sender_id, created_at, id) index."""
+    stmt = summary_feed_statement().where(Shoutout.sender_id == user_id)
+    shouts, next_cursor = _keyset_page(db, stmt, limit, cursor)
+    return _summary_page(db, shouts, next_cursor, viewer_id)
+
+def list_received_shoutouts_page(db: Session, user_id: int, limit: int = 20, cursor: str = None, viewer_id: int = None):
+    """
+    Shoutouts a user received, newest first. Ordered by shoutout id (which
+    follows creation order) so each page is a range scan of the
+    (recipient_id, shoutout_id) index.
+    """
+    stmt = summary_feed_statement().join(
+        shoutout_recipient_table, shoutout_recipient_table.c.shoutout_id == Shoutout.id
+    ).where(shoutout_recipient_table.c.recipient_id == user_id)
+    if cursor:
+        _, shoutout_id = decode_cursor(cursor)
+        stmt = stmt.where(shoutout_recipient_table.c.shoutout_id < shoutout_id)
+    rows = db.execute(
+        stmt.order_by(shoutout_recipient_table.c.shoutout_id.desc()).limit(limit + 1)
+    ).scalars().all()
+    shouts, next_cursor = _split_page(rows, limit)
+    return _summary_page(db, shouts, next_cursor, viewer_id)
+
+def list_reactors(db: Session, shoutout_id: int, kind: str, limit: int = 50, after: int = None):
+    """
+    Returns one page of users who reacted with `kind`, ordered by user id.
+    `after` is the last user id of the previous page.
+    """
+    rows = db.execute(reactors_statement(shoutout_id, kind, limit, after)).scalars().all()
+    items = rows[:limit]
+    next_cursor = items[-1].id if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
 
 def get_shoutout(db: Session, shoutout_id: int):
     return db.get(Shoutout, shoutout_id)
@@ -67,94 +489,79 @@ def update_shoutout(db: Session, shoutout_id: int, payload):
         shout.title = payload.title
     if payload.message:
         shout.message = payload.message
+    shout.updated_at = datetime.utcnow()
+    index_shoutouts(db, [shoutout_id])
     db.commit()
+    response_cache.bump()
     db.refresh(shout)
     return shout
 
 def delete_shoutout(db: Session, shoutout_id: int):
     shout = db.get(Shoutout, shoutout_id)
     if shout:
+        recipient_ids = db.query(shoutout_recipient_table.c.recipient_id).filter(
+            shoutout_recipient_table.c.shoutout_id == shoutout_id
+        ).all()
+        adjust_recognition_counts(db, {rid: -1 for (rid,) in recipient_ids})
+        adjust_tag_usage(db, get_tag_usage_deltas(db, [shoutout_id]))
         db.delete(shout)
+        index_shoutouts(db, [shoutout_id])
         db.commit()
+        response_cache.bump()
     return True
 
-def toggle_like(db: Session, shoutout_id: int, user_id: int):
-    shout = db.get(Shoutout, shoutout_id)
-    if not shout:
+def reaction_notification(kind: str, sender_id: int, user_name: str) -> NotificationCreate:
+    notif_type, verb = REACTION_NOTIFICATIONS[kind]
+    return NotificationCreate(
+        recipient_id=sender_id,
+        type=notif_type,
+        message=f"{user_name} {verb} your shoutout",
+        link=f"/dashboard"
+    )
+
+def _toggle_reaction(db: Session, shoutout_id: int, user_id: int, kind: str):
+    """
+    Flips a single row in the reaction table without loading the reactor
+    collection: DELETE first, and if nothing was removed INSERT with
+    ON CONFLICT DO NOTHING so concurrent double-clicks can't fail.
+    """
+    sender_id = db.query(Shoutout.sender_id).filter(Shoutout.id == shoutout_id).scalar()
+    if sender_id is None:
         return None
-    user = db.get(User, user_id)
-    if not user:
+    user_name = db.query(User.name).filter(User.id == user_id).scalar()
+    if user_name is None:
         return None
-        
-    if user in shout.likes:
-        shout.likes.remove(user)
-    else:
-        shout.likes.append(user)
+
+    table = REACTION_TABLES[kind]
+    removed = db.execute(
+        table.delete().where(table.c.shoutout_id == shoutout_id, table.c.user_id == user_id)
+    ).rowcount
+    reacted = not removed
+    if reacted:
+        inserted = db.execute(
+            insert_ignoring_conflicts(db, table).values(shoutout_id=shoutout_id, user_id=user_id)
+        ).rowcount
         # Notify author if not self-reaction
-        if shout.sender_id != user_id:
-            notif = NotificationCreate(
-                recipient_id=shout.sender_id,
-                type="like",
-                message=f"{user.name} liked your shoutout",
-                link=f"/dashboard" # TBD specific link
-            )
-            create_notification(db, notif)
-    
+        if inserted and sender_id != user_id:
+            enqueue_notifications(db, [reaction_notification(kind, sender_id, user_name)])
+    else:
+        inserted = 0
+
+    adjust_reaction_counts(db, {(shoutout_id, kind): inserted - removed})
+    count = db.execute(reaction_count_statement(shoutout_id, kind)).scalar() or 0
     db.commit()
-    db.refresh(shout)
-    return shout
+    dispatcher.wake()
+    response_cache.bump()
+    return {"shoutout_id": shoutout_id, "reacted": reacted, "count": count}
+
+def toggle_like(db: Session, shoutout_id: int, user_id: int):
+    return _toggle_reaction(db, shoutout_id, user_id, "likes")
 
 def toggle_clap(db: Session, shoutout_id: int, user_id: int):
-    shout = db.get(Shoutout, shoutout_id)
-    if not shout:
-        return None
-    user = db.get(User, user_id)
-    if not user:
-        return None
-        
-    if user in shout.claps:
-        shout.claps.remove(user)
-    else:
-        shout.claps.append(user)
-        # Notify author if not self-reaction
-        if shout.sender_id != user_id:
-            notif = NotificationCreate(
-                recipient_id=shout.sender_id,
-                type="clap",
-                message=f"{user.name} clapped for your shoutout",
-                link=f"/dashboard"
-            )
-            create_notification(db, notif)
-    
-    db.commit()
-    db.refresh(shout)
-    return shout
+    return _toggle_reaction(db, shoutout_id, user_id, "claps")
 
 def toggle_star(db: Session, shoutout_id: int, user_id: int):
-    shout = db.get(Shoutout, shoutout_id)
-    if not shout:
-        return None
-    user = db.get(User, user_id)
-    if not user:
-        return None
-        
-    if user in shout.stars:
-        shout.stars.remove(user)
-    else:
-        shout.stars.append(user)
-        # Notify author if not self-reaction
-        if shout.sender_id != user_id:
-            notif = NotificationCreate(
-                recipient_id=shout.sender_id,
-                type="star",
-                message=f"{user.name} starred your shoutout",
-                link=f"/dashboard"
-            )
-            create_notification(db, notif)
-    
-    db.commit()
-    db.refresh(shout)
-    return shout
+    return _toggle_reaction(db, shoutout_id, user_id, "stars")
 
 
 def add_comment(db: Session, shoutout_id: int, user_id: int, content: str, parent_id: int = None):
@@ -169,8 +576,6 @@ def add_comment(db: Session, shoutout_id: int, user_id: int, content: str, paren
         parent_id=parent_id
     )
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
 
     # Notify shoutout author
     if shout.sender_id != user_id:
@@ -182,10 +587,109 @@ def add_comment(db: Session, shoutout_id: int, user_id: int, content: str, paren
             message=f"{author_name} commented on your shoutout",
             link=f"/dashboard"
         )
-        create_notification(db, notif)
+        enqueue_notifications(db, [notif])
+
+    index_shoutouts(db, [shoutout_id])
+    db.commit()
+    dispatcher.wake()
+    response_cache.bump()
+    db.refresh(comment)
 
     return comment
 
+def comment_thread_statement(shoutout_id: int, parent_id: int = None, limit: int = 20, cursor: str = None,
+                             replies_limit: int = COMMENT_REPLIES_PER_NODE, max_depth: int = COMMENT_THREAD_MAX_DEPTH):
+    """
+    One recursive query for a page of comments under `parent_id` (None for
+    top-level) plus their first replies_limit replies at each level down to
+    max_depth, with each comment's author and direct reply count. Anchor
+    rows carry their position (rn > 0); the limit + 1'th anchor is only
+    there to detect a next page, so its subtree is not walked.
+    """
+    anchor = select(
+        Comment.id,
+        func.row_number().over(order_by=(Comment.created_at, Comment.id)).label("rn"),
+    ).where(
+        Comment.shoutout_id == shoutout_id,
+        Comment.parent_id.is_(None) if parent_id is None else Comment.parent_id == parent_id,
+    )
+    if cursor:
+        created_at, comment_id = decode_cursor(cursor)
+        anchor = anchor.where(or_(
+            Comment.created_at > created_at,
+            and_(Comment.created_at == created_at, Comment.id > comment_id)
+        ))
+    anchor = anchor.order_by(Comment.created_at, Comment.id).limit(limit + 1).subquery()
+
+    tree = select(anchor.c.id, anchor.c.rn, literal(0).label("depth")).cte("comment_tree", recursive=True)
+    # SQLite allows no window functions in the recursive step, so each
+    # parent's first replies come from a correlated LIMIT instead of row_number().
+    sibling = aliased(Comment)
+    first_replies = (
+        select(sibling.id)
+        .where(sibling.shoutout_id == shoutout_id, sibling.parent_id == tree.c.id)
+        .order_by(sibling.created_at, sibling.id)
+        .limit(replies_limit)
+    )
+    child = aliased(Comment)
+    tree = tree.union_all(
+        select(child.id, literal(0), tree.c.depth + 1)
+        .join(tree, child.id.in_(first_replies))
+        .where(tree.c.rn <= limit, tree.c.depth < max_depth)
+    )
+
+    replies = aliased(Comment)
+    reply_count = select(func.count(replies.id)).where(
+        replies.shoutout_id == Comment.shoutout_id,
+        replies.parent_id == Comment.id
+    ).scalar_subquery()
+    return (
+        select(Comment, tree.c.rn, tree.c.depth, reply_count.label("reply_count"))
+        .join(tree, Comment.id == tree.c.id)
+        .options(joinedload(Comment.author))
+    )
+
+def get_comment_thread(db: Session, shoutout_id: int, parent_id: int = None, limit: int = 20, cursor: str = None,
+                       replies_limit: int = COMMENT_REPLIES_PER_NODE, max_depth: int = COMMENT_THREAD_MAX_DEPTH):
+    """
+    Returns one page of comments under `parent_id`, oldest first, each with
+    its replies nested up to max_depth. A comment shows at most
+    replies_limit replies; when reply_count is larger, the rest are paged
+    through get_comment_thread(parent_id=comment id, cursor=replies_cursor).
+    """
+    rows = db.execute(comment_thread_statement(shoutout_id, parent_id, limit, cursor, replies_limit, max_depth)).all()
+    rows.sort(key=lambda row: (row.Comment.created_at, row.Comment.id))
+
+    nodes = {}
+    children = {}
+    anchors = []
+    for row in rows:
+        comment = row.Comment
+        node = nodes[comment.id] = {
+            "id": comment.id,
+            "content": comment.content,
+            "parent_id": comment.parent_id,
+            "author": comment.author,
+            "created_at": comment.created_at,
+            "reply_count": row.reply_count,
+            "replies": [],
+            "replies_cursor": None,
+        }
+        if row.rn:
+            anchors.append(node)
+        else:
+            children.setdefault(comment.parent_id, []).append(node)
+
+    for node_id, node in nodes.items():
+        shown = children.get(node_id, [])
+        node["replies"] = shown
+        if node["reply_count"] > len(shown) and shown:
+            node["replies_cursor"] = encode_cursor(shown[-1]["created_at"], shown[-1]["id"])
+
+    items = anchors[:limit]
+    next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"]) if len(anchors) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
 def get_recent_reactions(db: Session, limit: int = 5):
     # This is a bit complex with mixed likes and comments. 
     # For now, let's return just recent comments as "reactions" for the widget
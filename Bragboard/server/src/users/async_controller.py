@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.replica import get_async_read_db, read_cache_key
+from src.cache import response_cache
+from src.users import async_service
+
+# Mounted ahead of controller.router when ASYNC_DB is enabled; same paths and responses.
+router = APIRouter(prefix="/users", tags=["Users"])
+
+@router.get("/leaderboard")
+async def get_leaderboard(db: AsyncSession = Depends(get_async_read_db)):
+    return await response_cache.aget_or_set(read_cache_key(db, "leaderboard"), lambda: async_service.get_leaderboard(db))
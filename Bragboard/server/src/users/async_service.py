@@ -0,0 +1,6 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from .service import leaderboard_statement, format_leaderboard
+
+
+async def get_leaderboard(db: AsyncSession, limit: int = 5):
+    return format_leaderboard((await db.execute(leaderboard_statement(limit))).all())
@@ -1,19 +1,55 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from src.database.core import get_db
+from src.database.replica import get_read_db, read_cache_key
+from src.cache import response_cache
 from src.users import service
+from src.auth.service import load_principal
+from src.todos.service import list_sent_shoutouts_page, list_received_shoutouts_page
+from src.todos.models import ShoutoutSummaryPage
 from src.users.models import UserRead
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("", response_model=list[UserRead])
-def get_users(db: Session = Depends(get_db)):
+def get_users(db: Session = Depends(get_read_db)):
     return service.list_users(db)
 
 @router.get("/leaderboard")
-def get_leaderboard(db: Session = Depends(get_db)):
-    return service.get_leaderboard(db)
+def get_leaderboard(db: Session = Depends(get_read_db)):
+    return response_cache.get_or_set(read_cache_key(db, "leaderboard"), lambda: service.get_leaderboard(db))
 
 @router.get("/top-tagged")
-def get_top_tagged(db: Session = Depends(get_db)):
-    return service.get_top_tagged(db)
+def get_top_tagged(db: Session = Depends(get_read_db)):
+    return response_cache.get_or_set(read_cache_key(db, "top_tagged"), lambda: service.get_top_tagged(db))
+
+def _timeline(db: Session, key: str, loader, user_id: int, limit: int, cursor: Optional[str], viewer_id: Optional[int]):
+    if not load_principal(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    try:
+        return response_cache.get_or_set(
+            read_cache_key(db, key, user_id, limit, cursor, viewer_id),
+            lambda: ShoutoutSummaryPage.model_validate(loader(db, user_id, limit, cursor, viewer_id))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{user_id}/shoutouts/sent", response_model=ShoutoutSummaryPage)
+def get_sent_shoutouts(
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    viewer_id: Optional[int] = Query(None, description="User whose own reactions are flagged"),
+    db: Session = Depends(get_read_db)
+):
+    return _timeline(db, "sent_timeline", list_sent_shoutouts_page, user_id, limit, cursor, viewer_id)
+
+@router.get("/{user_id}/shoutouts/received", response_model=ShoutoutSummaryPage)
+def get_received_shoutouts(
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    viewer_id: Optional[int] = Query(None, description="User whose own reactions are flagged"),
+    db: Session = Depends(get_read_db)
+):
+    return _timeline(db, "received_timeline", list_received_shoutouts_page, user_id, limit, cursor, viewer_id)
@@ -1,15 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, insert, select
 from src.entities.user import User
-from src.entities.todo import shoutout_recipient_table
+from src.entities.todo import Shoutout, shoutout_recipient_table, UserRecognitionCount
+from src.database.core import adjust_counters
 from src.auth.schemas import UserCreate
 from src.auth.auth import hash_password
+from src.auth.service import principal_cache
+from src.cache import response_cache
 
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user: UserCreate):
-    hashed_pwd = hash_password(user.password)
+def create_user(db: Session, user: UserCreate, password_hash: str = None):
+    hashed_pwd = password_hash or hash_password(user.password)
     db_user = User(
         email=user.email,
         name=user.full_name or user.email.split('@')[0],
@@ -20,6 +23,7 @@ def create_user(db: Session, user: UserCreate):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    principal_cache.bump()
 
     # Trigger Welcome Notification
     from src.notifications.service import create_notification
@@ -38,33 +42,95 @@ def create_user(db: Session, user: UserCreate):
 
     return db_user
 
+def update_user(db: Session, user: User, name: str = None, role: str = None, department: str = None) -> User:
+    """
+    Changes a user's name, role and/or department and drops the caches that
+    embed them, so the change takes effect at once.
+    """
+    if name is not None:
+        user.name = name
+    if role is not None:
+        user.role = role
+    if department is not None:
+        user.department = department
+    db.commit()
+    principal_cache.bump()
+    if name is not None or department is not None:
+        # Cached feeds, timelines and comment threads embed users via UserRead
+        response_cache.bump()
+    if name is not None:
+        # Report PDFs print user names
+        from src.shoutout_reports.export_jobs import invalidate_cached_exports
+        invalidate_cached_exports()
+    return user
+
 def list_users(db: Session):
     return db.query(User).all()
 
 def get_admin_users(db: Session):
     return db.query(User).filter(User.role == "admin").all()
 
+def adjust_recognition_counts(db: Session, deltas: dict):
+    """
+    Applies {user_id: delta} to the leaderboard counters without committing,
+    so callers keep them in the same transaction as the shoutout write.
+    """
+    adjust_counters(db, UserRecognitionCount.received_count, UserRecognitionCount.user_id, deltas)
+
+def rebuild_recognition_counts(db: Session) -> int:
+    """Recomputes every leaderboard counter from shoutout_recipients. Returns the number of rows written."""
+    db.query(UserRecognitionCount).delete(synchronize_session=False)
+    rows = db.query(
+        shoutout_recipient_table.c.recipient_id,
+        func.count(shoutout_recipient_table.c.shoutout_id)
+    ).group_by(shoutout_recipient_table.c.recipient_id).all()
+    if rows:
+        db.execute(insert(UserRecognitionCount).values([
+            {"user_id": user_id, "received_count": count} for user_id, count in rows
+        ]))
+    db.commit()
+    return len(rows)
+
+def ensure_recognition_counts(db: Session):
+    """Backfills the counters once when the table is new but shoutouts already exist."""
+    if db.query(UserRecognitionCount.user_id).first() is None and \
+            db.query(shoutout_recipient_table.c.recipient_id).first() is not None:
+        rebuild_recognition_counts(db)
+
+def get_recognition_deltas_for_sender(db: Session, sender_id: int) -> dict:
+    """Returns {recipient_id: -n} for shoutouts a user sent, for use before deleting that user."""
+    rows = db.query(
+        shoutout_recipient_table.c.recipient_id,
+        func.count(shoutout_recipient_table.c.shoutout_id)
+    ).join(
+        Shoutout, Shoutout.id == shoutout_recipient_table.c.shoutout_id
+    ).filter(Shoutout.sender_id == sender_id).group_by(shoutout_recipient_table.c.recipient_id).all()
+    return {user_id: -count for user_id, count in rows}
+
 def get_leaderboard(db: Session, limit: int = 5):
     """
     Returns users ordered by number of shoutouts received.
+    Reads the maintained counters through the received_count index.
     """
-    # Join User with shoutout_recipient_table and count
-    results = db.query(
+    return format_leaderboard(db.execute(leaderboard_statement(limit)).all())
+
+def leaderboard_statement(limit: int = 5):
+    return select(
         User,
-        func.count(shoutout_recipient_table.c.shoutout_id).label("score")
-    ).outerjoin(
-        shoutout_recipient_table, User.id == shoutout_recipient_table.c.recipient_id
-    ).group_by(
-        User.id
+        UserRecognitionCount.received_count
+    ).join(
+        UserRecognitionCount, UserRecognitionCount.user_id == User.id
+    ).where(
+        UserRecognitionCount.received_count > 0
     ).order_by(
-        desc("score")
-    ).limit(limit).all()
-    
+        desc(UserRecognitionCount.received_count)
+    ).limit(limit)
+
+def format_leaderboard(results):
     # Format for frontend: { name, score, ... }
     return [
         {"name": user.name, "score": score, "avatar": "", "id": user.id} 
         for user, score in results
-        if score > 0 # Optional: only show users with score? Or top N regardless.
     ]
 
 def get_top_tagged(db: Session, limit: int = 5):
@@ -10,6 +10,7 @@ from src.database.core import DATABASE_URL
 from src.entities.user import User
 # Notification must be imported to register the relationship back reference
 from src.entities.notification import Notification
+from src.users.service import update_user
 
 def promote_user(email):
     engine = create_engine(DATABASE_URL)
@@ -18,8 +19,9 @@ def promote_user(email):
 
     user = db.query(User).filter(User.email == email).first()
     if user:
-        user.role = "admin"
-        db.commit()
+        update_user(db, user, role="admin")
+        # A running server is a separate process; it sees the new role once its
+        # cached principal expires (PRINCIPAL_CACHE_TTL seconds).
         print(f"User {email} promoted to admin.")
     else:
         print(f"User {email} not found.")